@@ -1,8 +1,18 @@
-from .bot import Bot
+from .bot import Bot, BotPool
 from .model import Chat, ChatDetail, Comment, Page, User, Weibo
 from .net import NetTool
 
-__all__ = ["Bot", "NetTool", "Comment", "User", "Weibo", "Chat", "ChatDetail", "Page"]
+__all__ = [
+    "Bot",
+    "BotPool",
+    "NetTool",
+    "Comment",
+    "User",
+    "Weibo",
+    "Chat",
+    "ChatDetail",
+    "Page",
+]
 
 Chat.model_rebuild()
 Comment.model_rebuild()
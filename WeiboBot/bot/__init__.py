@@ -1,3 +1,4 @@
 from .bot import Bot
+from .pool import BotPool
 
-__all__ = ["Bot"]
+__all__ = ["Bot", "BotPool"]
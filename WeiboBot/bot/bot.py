@@ -1,130 +1,314 @@
 import asyncio
-import time
-from functools import wraps
+from collections import OrderedDict
+from contextlib import aclosing
+from datetime import timedelta
 from pathlib import Path
-from typing import Any, Callable, List, Optional, Union
+from typing import (
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from loguru import logger
+from tortoise import timezone
 
 from WeiboBot.bot.event import EventManager
-from WeiboBot.data import MentionCmtRead, WeiboRead, WeiboRepost, init_db
+from WeiboBot.bot.scheduler import AdaptiveInterval, Scheduler
+from WeiboBot.data import (
+    BotState,
+    MentionCmtRead,
+    RecordWriter,
+    SeenIndex,
+    WeiboRead,
+    WeiboRepost,
+    compact_db,
+    init_db,
+)
 from WeiboBot.model import Chat, User, Weibo
 from WeiboBot.net import NetTool
-
-
-def interval_control(interval: float):
-    """控制函数执行间隔的装饰器
-
-    Args:
-        interval (float): 执行间隔（秒）
-    """
-    last_run = {}
-
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        async def wrapper(*args, **kwargs) -> Any:
-            now = time.time()
-            func_name = func.__name__
-
-            # 如果是第一次执行或者已经超过间隔时间
-            if func_name not in last_run or now - last_run[func_name] >= interval:
-                last_run[func_name] = now
-                return await func(*args, **kwargs)
-
-        return wrapper
-
-    return decorator
+from WeiboBot.util import CookieStore
 
 
 class Bot(NetTool):
+    # 各循环的默认执行间隔（秒）
+    LOOP_INTERVALS: Dict[str, float] = {
+        "chat": 5,
+        "scan_pages": 5,
+        "mentions_cmt": 5,
+        "tick": 1,
+        "prune": 60 * 60,
+    }
+    # 自适应轮询的间隔范围（秒），最短, 最长
+    LOOP_BOUNDS: Dict[str, Tuple[float, float]] = {
+        "chat": (3, 60),
+        "scan_pages": (5, 120),
+        "mentions_cmt": (5, 120),
+    }
+    # 关注页面游标在 bot_state 表中的键
+    FEED_CURSOR_KEY = "feed_since_id"
+    # 用户主页游标的键，按用户ID区分
+    TIMELINE_CURSOR_KEY = "timeline_since_id:{uid}"
+
     def __init__(
         self,
-        cookies: Union[str, dict, Path] = Path("weibobot_cookies.json"),
+        cookies: Union[str, dict, Path, CookieStore] = Path("weibobot_cookies.json"),
         db_path: Path = "weibo_bot.db",
+        record_ttl: Optional[float] = 60 * 60 * 24 * 7,
+        db_pragmas: Optional[dict] = None,
+        write_behind: bool = False,
+        concurrent_handlers: bool = False,
+        handler_concurrency: Optional[Dict[str, int]] = None,
+        loop_intervals: Optional[Dict[str, float]] = None,
+        loop_jitter: float = 0.1,
+        adaptive_polling: bool = True,
+        loop_bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+        account: Optional[int] = None,
+        feed_max_pages: int = 5,
+        feed_max_retries: int = 3,
+        seen_capacity: Optional[int] = None,
+        **kwargs,
     ):
-        super(Bot, self).__init__(cookies)
-        self.event_manager = EventManager()
-        self.weibo_read = set()
+        """
+        Args:
+            cookies (Union[str, dict, Path, CookieStore]): 微博的cookies
+            db_path (Path): 数据库文件路径
+            record_ttl (Optional[float]): 已读/转发记录的保留时间（秒），None表示永久保留
+            db_pragmas (Optional[dict]): 覆盖默认的SQLite连接参数
+            write_behind (bool): 是否把已读/转发记录攒批后台写入
+            concurrent_handlers (bool): 是否并发处理同一批微博/评论/私信
+            handler_concurrency (Optional[Dict[str, int]]): 各事件类型的最大并发数
+            loop_intervals (Optional[Dict[str, float]]): 覆盖 LOOP_INTERVALS 中的循环间隔
+            loop_jitter (float): 轮询循环间隔的随机抖动比例
+            adaptive_polling (bool): 是否根据新内容的多少自动调整轮询间隔，
+                此时 loop_intervals 为初始间隔
+            loop_bounds (Optional[Dict[str, Tuple[float, float]]]): 覆盖 LOOP_BOUNDS
+                中的自适应间隔范围
+            account (Optional[int]): 已读/转发记录所属的账号，多个账号共用数据库时用于区分，
+                单独运行时默认为0，在 BotPool 中默认为登录的用户ID
+            feed_max_pages (int): 每次轮询关注页面时最多向后翻的页数
+            feed_max_retries (int): 新微博处理失败时最多尝试的次数，之后不再处理
+            seen_capacity (Optional[int]): 已读/转发索引中布隆过滤器的初始容量，
+                None表示按数据库中的记录数分配
+            **kwargs: 其余参数传给 NetTool
+        """
+        super(Bot, self).__init__(cookies, **kwargs)
+        self.event_manager = EventManager(concurrent_handlers, handler_concurrency)
+        self.weibo_read = SeenIndex(WeiboRead, seen_capacity)
+        self.mention_cmt_read = SeenIndex(MentionCmtRead, seen_capacity)
+        self.weibo_repost = SeenIndex(WeiboRepost, seen_capacity)
         self.db_path: Path = db_path
+        self._account = account
+        self.record_ttl = record_ttl
+        self.db_pragmas = db_pragmas
+        self.record_writer = RecordWriter() if write_behind else None
+        self.feed_since_id = 0  # 已处理到的最新微博ID
+        self.feed_max_pages = feed_max_pages
+        self.feed_max_retries = feed_max_retries
+        # 处理失败、等待下次轮询重试的微博：mid -> (微博, 已尝试次数)
+        self._feed_retries: OrderedDict[int, Tuple[Weibo, int]] = OrderedDict()
         self.mid: int = 0
         self.bot_info: Optional[User] = None
+        self.loop_intervals = {**self.LOOP_INTERVALS, **(loop_intervals or {})}
+        self.loop_bounds = {**self.LOOP_BOUNDS, **(loop_bounds or {})}
+        self.scheduler = Scheduler()
+        for name, func in (
+            ("chat", self.chat_loop),
+            ("scan_pages", self.scan_pages_loop),
+            ("mentions_cmt", self.mentions_cmt_loop),
+        ):
+            adaptive = None
+            if adaptive_polling:
+                adaptive = AdaptiveInterval(*self.loop_bounds[name])
+            self.scheduler.add(
+                name,
+                func,
+                self.loop_intervals[name],
+                jitter=loop_jitter,
+                adaptive=adaptive,
+            )
+        self.scheduler.add("tick", self.tick_loop, self.loop_intervals["tick"])
+        self.scheduler.add(
+            "prune",
+            self.prune_loop,
+            self.loop_intervals["prune"],
+            initial_delay=self.loop_intervals["prune"],
+        )
 
     async def __aenter__(self):
-        await init_db(self.db_path)
+        await self.setup_db()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.scheduler.stop()
+        if self.record_writer is not None:
+            await self.record_writer.close()
         await super().__aexit__(exc_type, exc_val, exc_tb)
 
     # region 数据库操作
+    @property
+    def account(self) -> int:
+        """已读/转发记录所属的账号"""
+        return self._account or 0
+
+    async def setup_db(self, init: bool = True):
+        """初始化数据库并预热已读索引
+
+        Args:
+            init (bool): 是否初始化数据库连接，数据库已由 BotPool 初始化时为False
+        """
+        if init:
+            await init_db(self.db_path, self.db_pragmas)
+        for index in (self.weibo_read, self.mention_cmt_read, self.weibo_repost):
+            index.account = self.account
+            await index.load()
+        cursor = await BotState.get_value(self.FEED_CURSOR_KEY, self.account)
+        self.feed_since_id = int(cursor or 0)
+        if self.record_writer is not None:
+            self.record_writer.start()
+
+    async def save_feed_cursor(self, since_id: int):
+        """保存关注页面的游标，重启后从这里继续"""
+        if since_id == self.feed_since_id:
+            return
+        self.feed_since_id = since_id
+        await BotState.set_value(self.FEED_CURSOR_KEY, str(since_id), self.account)
+
+    async def _save_records(self, model, mids: List[int]):
+        if self.record_writer is not None:
+            self.record_writer.put_many(model, mids, self.account)
+        else:
+            await model.bulk_create_records(mids, self.account)
+
     async def is_weibo_read(self, mid: Union[str, int]) -> bool:
-        weibo_read = await WeiboRead.get_by_mid(mid)
-        return weibo_read is not None
+        return await self.weibo_read.contains(mid)
 
     async def mark_weibo(self, mid: Union[str, int]):
         mid = int(mid)
-        await WeiboRead.create_record(mid)
+        await self._save_records(WeiboRead, [mid])
+        self.weibo_read.add(mid)
+
+    async def mark_weibos(self, mids: List[Union[str, int]]):
+        mids = [int(mid) for mid in mids]
+        await self._save_records(WeiboRead, mids)
+        self.weibo_read.add_many(mids)
 
     async def is_mention_cmt_read(self, mid: Union[str, int]) -> bool:
-        mention_cmt_read = await MentionCmtRead.get_by_mid(mid)
-        return mention_cmt_read is not None
+        return await self.mention_cmt_read.contains(mid)
 
     async def mark_mention_cmt(self, mid: Union[str, int]):
         mid = int(mid)
-        await MentionCmtRead.create_record(mid)
+        await self._save_records(MentionCmtRead, [mid])
+        self.mention_cmt_read.add(mid)
+
+    async def mark_mention_cmts(self, mids: List[Union[str, int]]):
+        mids = [int(mid) for mid in mids]
+        await self._save_records(MentionCmtRead, mids)
+        self.mention_cmt_read.add_many(mids)
 
     async def is_weibo_repost(self, mid: Union[str, int]) -> bool:
-        weibo_repost = await WeiboRepost.get_by_mid(mid)
-        return weibo_repost is not None
+        return await self.weibo_repost.contains(mid)
 
     async def mark_weibo_repost(self, mid: Union[str, int]):
         mid = int(mid)
-        await WeiboRepost.create_record(mid)
+        await self._save_records(WeiboRepost, [mid])
+        self.weibo_repost.add(mid)
+
+    async def prune_records(self) -> int:
+        """删除超过保留时间的记录并回收空间
+
+        Returns:
+            int: 删除的记录数
+        """
+        if self.record_ttl is None:
+            return 0
+        before = timezone.now() - timedelta(seconds=self.record_ttl)
+        deleted = 0
+        for index in (self.weibo_read, self.mention_cmt_read, self.weibo_repost):
+            count = await index.model.prune(before, self.account)
+            if count:
+                # 重新加载，让布隆过滤器随记录数收缩
+                await index.load()
+            deleted += count
+        if deleted:
+            await compact_db()
+            logger.info(f"清理过期记录 {deleted} 条")
+        return deleted
 
     # endregion
 
     # region 事件处理函数
-    @interval_control(5)  # 聊天检查间隔30秒
     async def chat_loop(self):
-        chat_list: List[Chat] = await self.chat_list()
-        for chat in chat_list:
-            if chat.unread > 0 and chat.scheme.find("gid") == -1:
-                chat_detail = await self.user_chat(chat.user.id)
-                if chat_detail is None:
-                    logger.warning(f"获取聊天失败:{chat.id}")
-                    continue
-                chat_detail.msgs = [
-                    msg for msg in chat_detail.msgs[: chat.unread] if msg.dm_type == 1
-                ]
-                for _, func in self.event_manager.msg_handler:
-                    await func(chat_detail)
-
-    @interval_control(5)  # @评论检查间隔10分钟
+        chat_details = []
+        async with self.scheduler.limit():
+            chat_list: List[Chat] = await self.chat_list()
+            for chat in chat_list:
+                if chat.unread > 0 and chat.scheme.find("gid") == -1:
+                    chat_detail = await self.user_chat(chat.user.id)
+                    if chat_detail is None:
+                        logger.warning(f"获取聊天失败:{chat.id}")
+                        continue
+                    chat_detail.msgs = [
+                        msg
+                        for msg in chat_detail.msgs[: chat.unread]
+                        if msg.dm_type == 1
+                    ]
+                    chat_details.append(chat_detail)
+        await self.event_manager.dispatch_many("msg", chat_details)
+        return len(chat_details)
+
     async def mentions_cmt_loop(self):
-        cmt_list = await self.mentions_cmt()
-        for cmt in cmt_list:
-            if await self.is_mention_cmt_read(cmt.mid):
-                continue
-            for _, func in self.event_manager.mention_cmt_handler:
-                await func(cmt)
-            await self.mark_mention_cmt(cmt.mid)
+        async with self.scheduler.limit():
+            cmt_list = await self.mentions_cmt(
+                unseen=self.mention_cmt_read.filter_unseen
+            )
+        new_cmts = {int(cmt.mid): cmt for cmt in cmt_list}
+        handled = await self.event_manager.dispatch_many(
+            "mention_cmt", list(new_cmts.values())
+        )
+        await self.mark_mention_cmts([cmt.mid for cmt in handled])
+        return len(new_cmts)
 
-    @interval_control(5)  # 页面扫描间隔5秒
     async def scan_pages_loop(self):
-        page = await self.refresh_page()
-        if not page or not page.statuses:
-            return
-        for weibo in page.statuses:
-            if await self.is_weibo_read(weibo.id):
+        # 已读的微博只取ID过滤，不构造模型
+        async with self.scheduler.limit():
+            new_weibos, newest = await self.poll_feed(
+                self.feed_since_id, self.feed_max_pages, self.weibo_read.filter_unseen
+            )
+        task = self.scheduler.get("scan_pages")
+        if task.adaptive is not None:
+            task.adaptive.suggest(self.feed_interval)
+        # 游标总是前进到最新，处理失败的微博放进重试列表，不必重新翻页
+        await self.save_feed_cursor(max(newest, self.feed_since_id))
+        fresh = {int(weibo.id) for weibo in new_weibos}
+        weibos = new_weibos + [
+            weibo for mid, (weibo, _) in self._feed_retries.items() if mid not in fresh
+        ]
+        if not weibos:
+            return 0
+        handled = await self.event_manager.dispatch_many("weibo", weibos)
+        await self.mark_weibos([weibo.id for weibo in handled])
+        handled_ids = {int(weibo.id) for weibo in handled}
+        for weibo in weibos:
+            mid = int(weibo.id)
+            _, attempts = self._feed_retries.pop(mid, (weibo, 0))
+            if mid in handled_ids:
+                continue
+            attempts += 1
+            if attempts >= self.feed_max_retries:
+                logger.warning(f"微博{mid}处理失败{attempts}次，不再重试")
                 continue
-            for _, func in self.event_manager.weibo_handler:
-                await func(weibo)
-            await self.mark_weibo(weibo.id)
+            self._feed_retries[mid] = (weibo, attempts)
+        return len(new_weibos)
 
-    @interval_control(1)  # 定时任务间隔1秒
     async def tick_loop(self):
-        for _, func in self.event_manager.tick_handler:
-            await func()
+        await self.event_manager.dispatch("tick")
+
+    async def prune_loop(self):
+        await self.prune_records()
 
     # endregion
 
@@ -141,6 +325,39 @@ class Bot(NetTool):
         await self.mark_weibo_repost(mid)
         return result
 
+    async def crawl_new_user_weibos(
+        self, uids: Iterable[Union[str, int]], concurrency: int = 4, **kwargs
+    ) -> AsyncIterator[Tuple[int, Weibo]]:
+        """并发获取多个用户自上次以来的新微博
+
+        各用户的游标保存在 bot_state 表中，全部获取完才会更新，中途退出时
+        下次会重新获取这部分微博。
+
+        Args:
+            uids (Iterable[Union[str, int]]): 用户ID
+            concurrency (int): 同时获取的用户数
+            **kwargs: 其余参数见 iter_user_weibos
+
+        Yields:
+            Tuple[int, Weibo]: 用户ID和微博
+        """
+        uids = [int(uid) for uid in uids]
+        since_ids = {}
+        for uid in uids:
+            key = self.TIMELINE_CURSOR_KEY.format(uid=uid)
+            since_ids[uid] = int(await BotState.get_value(key, self.account) or 0)
+        newest = dict(since_ids)
+        async with aclosing(
+            self.crawl_user_weibos(uids, since_ids, concurrency, **kwargs)
+        ) as weibos:
+            async for uid, weibo in weibos:
+                newest[uid] = max(newest[uid], int(weibo.id))
+                yield uid, weibo
+        for uid, since_id in newest.items():
+            if since_id != since_ids[uid]:
+                key = self.TIMELINE_CURSOR_KEY.format(uid=uid)
+                await BotState.set_value(key, str(since_id), self.account)
+
     # endregion
 
     # region 事件装饰器
@@ -159,25 +376,19 @@ class Bot(NetTool):
     # endregion
 
     # region 生命周期管理
-    async def lifecycle(self):
-        await init_db(self.db_path)
+    async def ensure_login(self) -> int:
+        """登录，cookies失效时改用扫码登录"""
         mid = await self.login()
         if mid == 0:
             logger.error("登录失败")
             await self.login_by_qr_code()
-            await self.check_login_status()
-        while True:
-            try:
-                await asyncio.gather(
-                    self.chat_loop(),
-                    self.scan_pages_loop(),
-                    self.mentions_cmt_loop(),
-                    self.tick_loop(),
-                )
-            except Exception as e:
-                logger.error(f"事件处理异常: {e}")
-            finally:
-                await asyncio.sleep(1)
+            mid = await self.check_login_status()
+        return mid
+
+    async def lifecycle(self):
+        await self.setup_db()
+        await self.ensure_login()
+        await self.scheduler.run()
 
     def run(self):
         loop = asyncio.get_event_loop()
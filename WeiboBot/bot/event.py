@@ -1,4 +1,7 @@
-from typing import Awaitable, Callable, List, Tuple, TypeAlias
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeAlias
+
+from loguru import logger
 
 from WeiboBot.model import Chat, Comment, Weibo
 
@@ -10,11 +13,78 @@ TickHandler: TypeAlias = Callable[[], Awaitable[None]]
 
 
 class EventManager:
-    def __init__(self):
+    def __init__(
+        self,
+        concurrent: bool = False,
+        concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: int = 4,
+    ):
+        """
+        Args:
+            concurrent (bool): 是否并发处理同一批事件中的多个对象
+            concurrency (Optional[Dict[str, int]]): 各事件类型的最大并发数，
+                键为 msg / weibo / mention_cmt / tick
+            default_concurrency (int): 未单独配置的事件类型的最大并发数
+        """
         self.msg_handler: List[Tuple[int, Callable]] = []
         self.weibo_handler: List[Tuple[int, Callable]] = []
         self.mention_cmt_handler: List[Tuple[int, Callable]] = []
         self.tick_handler: List[Tuple[int, Callable]] = []
+        self.concurrent = concurrent
+        self.concurrency = concurrency or {}
+        self.default_concurrency = default_concurrency
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, event: str) -> asyncio.Semaphore:
+        if event not in self._semaphores:
+            limit = self.concurrency.get(event, self.default_concurrency)
+            self._semaphores[event] = asyncio.Semaphore(limit)
+        return self._semaphores[event]
+
+    async def dispatch(self, event: str, *args: Any) -> bool:
+        """按优先级依次调用事件处理函数
+
+        某个处理函数抛出异常时会记录日志并跳过该对象剩余的处理函数，异常不会向上抛出。
+
+        Args:
+            event (str): 事件类型，msg / weibo / mention_cmt / tick
+
+        Returns:
+            bool: 所有处理函数是否都执行成功
+        """
+        for _, func in getattr(self, f"{event}_handler"):
+            try:
+                await func(*args)
+            except Exception as e:
+                logger.exception(f"{event}事件处理异常({func.__name__}): {e}")
+                return False
+        return True
+
+    async def dispatch_many(self, event: str, items: List[Any]) -> List[Any]:
+        """把一批对象分发给事件处理函数
+
+        并发模式下每个对象是一个任务，受该事件类型的信号量限制；
+        单个对象内部仍按优先级顺序执行。
+
+        Args:
+            event (str): 事件类型
+            items (List[Any]): 待处理的对象
+
+        Returns:
+            List[Any]: 处理成功的对象，保持原有顺序
+        """
+        if not self.concurrent:
+            return [item for item in items if await self.dispatch(event, item)]
+
+        semaphore = self._semaphore(event)
+
+        async def run(item: Any) -> bool:
+            async with semaphore:
+                return await self.dispatch(event, item)
+
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(run(item)) for item in items]
+        return [item for item, task in zip(items, tasks) if task.result()]
 
     def onNewMsg(self, priority: int = 10):
         """注册新消息处理函数
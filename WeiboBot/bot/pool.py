@@ -0,0 +1,115 @@
+import asyncio
+from pathlib import Path
+from typing import List, Optional, Union
+
+import httpx
+from loguru import logger
+
+from WeiboBot.bot.bot import Bot
+from WeiboBot.data import init_db
+from WeiboBot.net import SharedTransport, create_transport
+from WeiboBot.util import CookieStore
+
+
+class BotPool:
+    """在同一个事件循环中运行多个账号的 Bot
+
+    所有 Bot 共用一个连接池和一个数据库，cookies 仍由各自的客户端保存，
+    已读/转发记录按账号区分。
+    """
+
+    def __init__(
+        self,
+        db_path: Path = "weibo_bot.db",
+        db_pragmas: Optional[dict] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        max_concurrent_loops: int = 8,
+        seen_capacity: Optional[int] = None,
+    ):
+        """
+        Args:
+            db_path (Path): 共用的数据库文件路径
+            db_pragmas (Optional[dict]): 覆盖默认的SQLite连接参数
+            transport (Optional[httpx.AsyncBaseTransport]): 共用的连接池，
+                默认按 limits 和 http2 新建一个
+            limits (Optional[httpx.Limits]): 新建连接池的连接数和长连接保持时间
+            http2 (bool): 新建的连接池是否启用HTTP/2
+            max_concurrent_loops (int): 所有账号同时进行的轮询请求数上限，
+                只限制获取数据的部分，不限制事件处理、tick 和 prune；
+                已经自行设置了调度器 semaphore 的 Bot 不受影响
+            seen_capacity (Optional[int]): 各 Bot 已读/转发索引的布隆过滤器初始容量，
+                None表示按数据库中该账号的记录数分配
+        """
+        self.db_path = db_path
+        self.db_pragmas = db_pragmas
+        self.transport = transport or create_transport(limits, http2)
+        self.semaphore = asyncio.Semaphore(max_concurrent_loops)
+        self.seen_capacity = seen_capacity
+        self.bots: List[Bot] = []
+
+    def add_bot(
+        self,
+        cookies: Union[str, dict, Path, CookieStore] = Path("weibobot_cookies.json"),
+        **kwargs,
+    ) -> Bot:
+        """创建一个使用共享连接池和数据库的 Bot
+
+        Args:
+            cookies (Union[str, dict, Path, CookieStore]): 该账号的cookies，
+                可以用 DbCookieStore 保存在共用的数据库中
+            **kwargs: 其余参数传给 Bot，例如 timeout
+
+        Returns:
+            Bot: 新建的 Bot，可以继续用它注册事件处理函数
+        """
+        kwargs.setdefault("seen_capacity", self.seen_capacity)
+        bot = Bot(
+            cookies,
+            db_path=self.db_path,
+            transport=SharedTransport(self.transport),
+            **kwargs,
+        )
+        self.bots.append(bot)
+        return bot
+
+    def _stagger(self):
+        """错开各账号同名循环的首次执行时间，避免同时发出请求
+
+        错开时间每次按账号序号重新计算，重复调用 lifecycle 不会累加。
+        """
+        count = len(self.bots)
+        for i, bot in enumerate(self.bots):
+            if bot.scheduler.semaphore is None:
+                bot.scheduler.semaphore = self.semaphore
+            for task in bot.scheduler.tasks.values():
+                task.offset = task.interval * i / count
+
+    async def lifecycle(self):
+        await init_db(self.db_path, self.db_pragmas)
+        for bot in self.bots:
+            await bot.ensure_login()
+            if bot._account is None:
+                bot._account = bot.mid
+            await bot.setup_db(init=False)
+        logger.info(f"共 {len(self.bots)} 个账号已登录")
+        self._stagger()
+        await asyncio.gather(*(bot.scheduler.run() for bot in self.bots))
+
+    async def close(self):
+        for bot in self.bots:
+            await bot.__aexit__(None, None, None)
+        await self.transport.aclose()
+
+    def run(self):
+        async def main():
+            try:
+                await self.lifecycle()
+            finally:
+                await self.close()
+
+        try:
+            asyncio.run(main())
+        except KeyboardInterrupt:
+            logger.info("已安全退出")
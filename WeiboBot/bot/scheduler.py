@@ -0,0 +1,184 @@
+import asyncio
+import random
+from contextlib import nullcontext
+from typing import AsyncContextManager, Awaitable, Callable, Dict, Optional
+
+from loguru import logger
+
+from WeiboBot.exception import CircuitOpenError
+
+
+class AdaptiveInterval:
+    """根据每次轮询得到的新内容数调整间隔
+
+    有新内容时缩短间隔，连续为空时按倍数拉长，始终不低于服务端建议的间隔，
+    并限制在 [min_interval, max_interval] 之间。
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        backoff: float = 1.5,
+        speedup: float = 0.5,
+    ):
+        """
+        Args:
+            min_interval (float): 最短间隔（秒）
+            max_interval (float): 最长间隔（秒）
+            backoff (float): 没有新内容时间隔乘以的倍数
+            speedup (float): 有新内容时间隔乘以的倍数
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.speedup = speedup
+        self.suggested = 0.0
+
+    def suggest(self, interval: Optional[float]):
+        """记录服务端建议的间隔（秒），None表示没有建议"""
+        self.suggested = interval or 0.0
+
+    def update(self, interval: float, new_items: int) -> float:
+        """根据本次的新内容数计算下一次的间隔"""
+        interval *= self.speedup if new_items else self.backoff
+        floor = max(self.min_interval, min(self.suggested, self.max_interval))
+        return min(max(interval, floor), self.max_interval)
+
+
+class ScheduledTask:
+    """调度器中的一个周期任务"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable],
+        interval: float,
+        jitter: float = 0.0,
+        max_backoff: float = 300.0,
+        initial_delay: float = 0.0,
+        adaptive: Optional[AdaptiveInterval] = None,
+    ):
+        """
+        Args:
+            name (str): 任务名
+            func (Callable[[], Awaitable]): 每次执行的协程函数
+            interval (float): 执行间隔（秒）
+            jitter (float): 间隔的随机抖动比例，0.1表示±10%
+            max_backoff (float): 连续失败时退避的最长间隔（秒）
+            initial_delay (float): 第一次执行前的等待时间（秒）
+            adaptive (Optional[AdaptiveInterval]): 自适应间隔策略，此时 func
+                需要返回本次得到的新内容数，interval 作为初始间隔
+        """
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.initial_delay = initial_delay
+        self.offset = 0.0  # 附加在 initial_delay 上的错开时间，由 BotPool 设置
+        self.adaptive = adaptive
+        self.failures = 0  # 连续失败次数
+        self.overruns = 0  # 执行时间超过间隔的次数
+        self.last_elapsed = 0.0
+        self.retry_after: Optional[float] = None  # 距离熔断结束的时间
+
+    def next_delay(self, elapsed: float) -> float:
+        """计算距离下一次执行的等待时间
+
+        成功时按固定频率执行（扣除本次耗时），失败时按指数退避，
+        遇到熔断时等到熔断结束。
+        """
+        if self.retry_after is not None:
+            delay = max(self.retry_after, self.interval)
+        elif self.failures:
+            delay = min(self.interval * 2**self.failures, self.max_backoff)
+        else:
+            delay = max(self.interval - elapsed, 0.0)
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return delay
+
+    async def run_once(self):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            result = await self.func()
+            self.failures = 0
+            self.retry_after = None
+            if self.adaptive is not None and result is not None:
+                self.interval = self.adaptive.update(self.interval, result)
+        except CircuitOpenError as e:
+            self.retry_after = e.retry_after
+            logger.warning(f"{self.name} 暂停: {e}")
+        except Exception as e:
+            self.retry_after = None
+            self.failures += 1
+            logger.exception(f"{self.name} 执行异常(连续{self.failures}次): {e}")
+        self.last_elapsed = loop.time() - start
+        if self.last_elapsed > self.interval:
+            self.overruns += 1
+            logger.warning(
+                f"{self.name} 执行耗时{self.last_elapsed:.1f}秒，超过间隔{self.interval}秒"
+            )
+
+    async def run_forever(self):
+        await asyncio.sleep(self.initial_delay + self.offset)
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.next_delay(self.last_elapsed))
+
+
+class Scheduler:
+    """周期任务调度器，每个任务是独立的长期协程，互不等待"""
+
+    def __init__(self, semaphore: Optional[asyncio.Semaphore] = None):
+        """
+        Args:
+            semaphore (Optional[asyncio.Semaphore]): 限制同时进行的轮询请求数，
+                可在多个调度器之间共享。任务只在获取数据时通过 limit() 占用它，
+                处理事件、tick 和 prune 不受限制
+        """
+        self.semaphore = semaphore
+        self.tasks: Dict[str, ScheduledTask] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+
+    def add(
+        self, name: str, func: Callable[[], Awaitable], interval: float, **kwargs
+    ) -> ScheduledTask:
+        """注册一个周期任务，参数见 ScheduledTask"""
+        task = ScheduledTask(name, func, interval, **kwargs)
+        self.tasks[name] = task
+        return task
+
+    def get(self, name: str) -> Optional[ScheduledTask]:
+        return self.tasks.get(name)
+
+    def limit(self) -> AsyncContextManager:
+        """任务中获取数据的部分用 async with 包裹，没有设置 semaphore 时不限制"""
+        if self.semaphore is None:
+            return nullcontext()
+        return self.semaphore
+
+    def start(self):
+        """为每个尚未运行的任务创建协程"""
+        loop = asyncio.get_running_loop()
+        for name, task in self.tasks.items():
+            if name not in self._running or self._running[name].done():
+                self._running[name] = loop.create_task(
+                    task.run_forever(), name=f"weibobot-{name}"
+                )
+
+    async def stop(self):
+        for running in self._running.values():
+            running.cancel()
+        await asyncio.gather(*self._running.values(), return_exceptions=True)
+        self._running.clear()
+
+    async def run(self):
+        """启动所有任务并一直运行，直到被取消"""
+        self.start()
+        try:
+            await asyncio.gather(*self._running.values())
+        finally:
+            await self.stop()
@@ -1,4 +1,22 @@
-from .db import init_db
-from .record import MentionCmtRead, WeiboRead, WeiboRepost
+from .cache import DbCacheBackend
+from .cookie_store import DbCookieStore
+from .db import compact_db, init_db
+from .index import BloomFilter, ScalableBloomFilter, SeenIndex
+from .record import BotState, CacheEntry, MentionCmtRead, WeiboRead, WeiboRepost
+from .writer import RecordWriter
 
-__all__ = ["init_db", "WeiboRead", "MentionCmtRead", "WeiboRepost"]
+__all__ = [
+    "init_db",
+    "compact_db",
+    "WeiboRead",
+    "MentionCmtRead",
+    "WeiboRepost",
+    "BloomFilter",
+    "ScalableBloomFilter",
+    "SeenIndex",
+    "RecordWriter",
+    "BotState",
+    "DbCookieStore",
+    "CacheEntry",
+    "DbCacheBackend",
+]
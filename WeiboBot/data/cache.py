@@ -0,0 +1,55 @@
+import json
+import time
+from typing import Any, Optional, Tuple
+
+from WeiboBot.util import CacheBackend
+
+from .record import CacheEntry
+
+
+class DbCacheBackend(CacheBackend):
+    """保存在 response_cache 表中的缓存，需要先初始化数据库"""
+
+    def __init__(self, namespace: str = "default", prune_every: int = 100):
+        """
+        Args:
+            namespace (str): 键的前缀，多个账号共用数据库时用于区分
+            prune_every (int): 每写入多少次清理一次过期的缓存
+        """
+        self.namespace = namespace
+        self.prune_every = prune_every
+        self._writes = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        entry = await CacheEntry.filter(
+            key=self._key(key), expires_at__gt=time.time()
+        ).first()
+        if entry is None:
+            return None
+        return json.loads(entry.value), entry.expires_at
+
+    async def set(self, key: str, value: Any, expires_at: float):
+        await CacheEntry.update_or_create(
+            defaults={
+                "value": json.dumps(value, ensure_ascii=False),
+                "expires_at": expires_at,
+            },
+            key=self._key(key),
+        )
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            await self.prune()
+
+    async def delete(self, key: str):
+        await CacheEntry.filter(key=self._key(key)).delete()
+
+    async def prune(self) -> int:
+        """删除已过期的缓存
+
+        Returns:
+            int: 删除的条数
+        """
+        return await CacheEntry.filter(expires_at__lte=time.time()).delete()
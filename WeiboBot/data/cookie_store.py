@@ -0,0 +1,25 @@
+import json
+from typing import Dict, Optional
+
+from WeiboBot.util import CookieStore
+
+from .record import BotState
+
+
+class DbCookieStore(CookieStore):
+    """保存在 bot_state 表中的cookies，需要先初始化数据库"""
+
+    def __init__(self, name: str = "default"):
+        """
+        Args:
+            name (str): 区分不同账号的名字
+        """
+        super().__init__()
+        self.key = f"cookies:{name}"
+
+    async def _load(self) -> Optional[Dict[str, str]]:
+        value = await BotState.get_value(self.key)
+        return json.loads(value) if value is not None else None
+
+    async def _save(self, cookies: Dict[str, str]):
+        await BotState.set_value(self.key, json.dumps(cookies, ensure_ascii=False))
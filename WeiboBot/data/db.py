@@ -1,11 +1,127 @@
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Type, Union
+from urllib.parse import urlencode
 
-from tortoise import Tortoise
+from loguru import logger
+from tortoise import Tortoise, timezone
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.utils import get_schema_sql
 
+from .record import MentionCmtRead, MidRecord, WeiboRead, WeiboRepost
 
-async def init_db(db_path: Path):
+# 数据库结构版本，保存在 PRAGMA user_version 中
+SCHEMA_VERSION = 5
+# 记录表结构最后一次变化的版本，低于此版本的数据库需要重建记录表
+RECORD_SCHEMA_VERSION = 3
+
+RECORD_MODELS: List[Type[MidRecord]] = [WeiboRead, MentionCmtRead, WeiboRepost]
+
+# SQLite连接参数，在每个连接建立时以 PRAGMA 执行
+DEFAULT_PRAGMAS: Dict[str, Union[str, int]] = {
+    "journal_mode": "WAL",  # 读写互不阻塞
+    "synchronous": "NORMAL",  # WAL下只在检查点fsync
+    "mmap_size": 256 * 1024 * 1024,  # 256MB内存映射
+    "cache_size": -64 * 1024,  # 64MB页缓存（负数单位为KB）
+    "temp_store": "MEMORY",
+}
+
+# 重建记录表时，旧表中没有的列的填充值（SQL字面量）
+_COLUMN_FILLS: Dict[str, Callable[[], str]] = {
+    "created_at": lambda: f"'{timezone.now().isoformat(' ')}'",
+    "account": lambda: "0",
+}
+
+
+async def init_db(db_path: Path, pragmas: Optional[Dict[str, Union[str, int]]] = None):
+    """初始化数据库连接并升级结构
+
+    Args:
+        db_path (Path): 数据库文件路径
+        pragmas (Optional[Dict[str, Union[str, int]]]): 覆盖 DEFAULT_PRAGMAS 的连接参数
+    """
+    pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
     await Tortoise.init(
-        db_url=f"sqlite://{db_path}",
+        db_url=f"sqlite://{db_path}?{urlencode(pragmas)}",
         modules={"models": ["WeiboBot.data.record"]},
     )
+    conn = Tortoise.get_connection("default")
+    await migrate_db(conn)
+    await _ensure_incremental_vacuum(conn)
     await Tortoise.generate_schemas()
+
+
+async def _ensure_incremental_vacuum(conn: BaseDBAsyncClient):
+    """开启增量VACUUM，已有数据库需要一次完整的VACUUM才能生效"""
+    rows = await conn.execute_query_dict("PRAGMA auto_vacuum")
+    if rows[0]["auto_vacuum"] != 2:
+        await conn.execute_script("PRAGMA auto_vacuum = INCREMENTAL; VACUUM;")
+
+
+async def compact_db(pages: int = 0):
+    """回收空闲页，缩小数据库文件
+
+    Args:
+        pages (int): 最多回收的页数，0表示全部回收
+    """
+    conn = Tortoise.get_connection("default")
+    await conn.execute_script(f"PRAGMA incremental_vacuum({pages})")
+    # WAL模式下需要检查点才会真正截断主文件
+    await conn.execute_script("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+async def _table_columns(conn: BaseDBAsyncClient, table: str) -> List[str]:
+    rows = await conn.execute_query_dict(f'PRAGMA table_info("{table}")')
+    return [row["name"] for row in rows]
+
+
+async def migrate_db(conn: BaseDBAsyncClient):
+    """把旧版本的数据库原地升级到当前结构
+
+    记录表通过"改名-建新表-去重拷贝-删旧表"的方式重建，整个过程在一个事务中完成。
+    """
+    rows = await conn.execute_query_dict("PRAGMA user_version")
+    version = rows[0]["user_version"]
+    if version >= SCHEMA_VERSION:
+        return
+
+    legacy = {}
+    if version < RECORD_SCHEMA_VERSION:
+        for model in RECORD_MODELS:
+            table = model._meta.db_table
+            columns = await _table_columns(conn, table)
+            if columns:
+                legacy[table] = columns
+
+    if not legacy:
+        await conn.execute_script(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return
+
+    logger.info(f"升级数据库结构: {version} -> {SCHEMA_VERSION}")
+    script = ["BEGIN"]
+    for table in legacy:
+        indexes = await conn.execute_query_dict(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            [table],
+        )
+        script += [f'DROP INDEX "{row["name"]}"' for row in indexes]
+        script.append(f'ALTER TABLE "{table}" RENAME TO "{table}__old"')
+    script.append(get_schema_sql(conn, safe=True))
+    for model in RECORD_MODELS:
+        table = model._meta.db_table
+        if table not in legacy:
+            continue
+        new_columns = set(model._meta.fields_db_projection.values()) - {"id"}
+        common = [c for c in legacy[table] if c in new_columns]
+        fills = {c: fill() for c, fill in _COLUMN_FILLS.items() if c not in common}
+        columns = ", ".join(f'"{c}"' for c in [*common, *fills])
+        values = ", ".join([*(f'"{c}"' for c in common), *fills.values()])
+        # 按主键顺序拷贝，重复的行只保留最早的一条
+        script.append(
+            f'INSERT OR IGNORE INTO "{table}" ({columns}) '
+            f'SELECT {values} FROM "{table}__old" ORDER BY "id"'
+        )
+        script.append(f'DROP TABLE "{table}__old"')
+    script.append(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    script.append("COMMIT")
+    await conn.execute_script(";\n".join(script) + ";")
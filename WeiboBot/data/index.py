@@ -0,0 +1,188 @@
+import hashlib
+import math
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Set, Type, Union
+
+from loguru import logger
+from tortoise import models
+
+
+class BloomFilter:
+    """固定内存的布隆过滤器，只会误报不会漏报"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Args:
+            capacity (int): 预期元素数量
+            error_rate (float): 预期误判率
+        """
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: int):
+        digest = hashlib.blake2b(
+            key.to_bytes(8, "little", signed=True), digest_size=16
+        ).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: int):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: int) -> bool:
+        return all(
+            self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key)
+        )
+
+
+class ScalableBloomFilter:
+    """容量不够时追加一个两倍容量的布隆过滤器，不需要预先按最大数据量分配内存"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Args:
+            capacity (int): 第一个过滤器的预期元素数量
+            error_rate (float): 每个过滤器的预期误判率
+        """
+        self.error_rate = error_rate
+        self.filters: List[BloomFilter] = [BloomFilter(capacity, error_rate)]
+
+    @property
+    def capacity(self) -> int:
+        return sum(f.capacity for f in self.filters)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(f.bits) for f in self.filters)
+
+    def add(self, key: int):
+        current = self.filters[-1]
+        if current.count >= current.capacity:
+            current = BloomFilter(current.capacity * 2, self.error_rate)
+            self.filters.append(current)
+        current.add(key)
+
+    def __contains__(self, key: int) -> bool:
+        return any(key in f for f in self.filters)
+
+
+class SeenIndex:
+    """记录表的内存索引
+
+    布隆过滤器判断"一定没见过"时直接返回，不访问数据库；
+    判断"可能见过"时才回落到SQLite确认，确认过的ID放入有界的LRU集合中。
+    过滤器按加载时的记录数分配，之后按需扩容；记录按保留时间清理后重新加载即可收缩。
+    """
+
+    def __init__(
+        self,
+        model: Type[models.Model],
+        capacity: Optional[int] = None,
+        min_capacity: int = 10_000,
+        error_rate: float = 0.001,
+        recent_size: int = 10_000,
+        account: int = 0,
+    ):
+        """
+        Args:
+            model (Type[models.Model]): 记录表模型，需要提供 get_by_mid
+            capacity (Optional[int]): 布隆过滤器的初始容量，
+                None表示按加载时记录数的两倍分配
+            min_capacity (int): 自动分配时的最小容量
+            error_rate (float): 布隆过滤器的预期误判率
+            recent_size (int): 已确认ID的LRU集合大小
+            account (int): 只索引该账号的记录
+        """
+        self.model = model
+        self.account = account
+        self.capacity = capacity
+        self.min_capacity = min_capacity
+        self.error_rate = error_rate
+        self.recent_size = recent_size
+        self.bloom = ScalableBloomFilter(capacity or min_capacity, error_rate)
+        self.recent: OrderedDict[int, None] = OrderedDict()
+
+    async def load(self, chunk_size: int = 10_000):
+        """从数据库预热索引，按主键分批读取，避免一次性载入整张表
+
+        重新加载时保留LRU集合，尚未写入数据库的记录仍然算作见过。
+        """
+        total = await self.model.filter(account=self.account).count()
+        if self.capacity is None:
+            capacity = max(self.min_capacity, total * 2)
+        else:
+            capacity = max(self.capacity, total)
+        self.bloom = ScalableBloomFilter(capacity, self.error_rate)
+        last_id = 0
+        while True:
+            rows = (
+                await self.model.filter(account=self.account, id__gt=last_id)
+                .order_by("id")
+                .limit(chunk_size)
+                .values_list("id", "mid")
+            )
+            if not rows:
+                break
+            for _, mid in rows:
+                self.bloom.add(mid)
+            last_id = rows[-1][0]
+        logger.debug(f"{self.model.__name__} 索引已加载 {total} 条记录")
+
+    def _remember(self, mid: int):
+        self.recent[mid] = None
+        self.recent.move_to_end(mid)
+        if len(self.recent) > self.recent_size:
+            self.recent.popitem(last=False)
+
+    def add(self, mid: Union[str, int]):
+        """登记一个新写入的ID"""
+        mid = int(mid)
+        self.bloom.add(mid)
+        self._remember(mid)
+
+    def add_many(self, mids: Iterable[Union[str, int]]):
+        """批量登记新写入的ID"""
+        for mid in mids:
+            self.add(mid)
+
+    async def contains(self, mid: Union[str, int]) -> bool:
+        """判断ID是否已经记录过"""
+        mid = int(mid)
+        if mid in self.recent:
+            self.recent.move_to_end(mid)
+            return True
+        if mid not in self.bloom:
+            return False
+        if await self.model.get_by_mid(mid, self.account) is None:
+            return False
+        self._remember(mid)
+        return True
+
+    async def filter_unseen(self, mids: Iterable[Union[str, int]]) -> Set[int]:
+        """批量判断，返回其中没有记录过的ID
+
+        所有"可能见过"的ID合并成一次 get_existing_mids 查询。
+        """
+        unseen = set()
+        maybe_seen = set()
+        for mid in map(int, mids):
+            if mid in self.recent:
+                self.recent.move_to_end(mid)
+            elif mid in self.bloom:
+                maybe_seen.add(mid)
+            else:
+                unseen.add(mid)
+        if maybe_seen:
+            existing = await self.model.get_existing_mids(maybe_seen, self.account)
+            for mid in existing:
+                self._remember(mid)
+            unseen |= maybe_seen - existing
+        return unseen
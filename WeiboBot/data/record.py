@@ -1,55 +1,148 @@
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
+
 from tortoise import fields, models
+from tortoise.transactions import in_transaction
+
+
+class MidRecord(models.Model):
+    """以(account, mid)为键的记录表基类
 
+    account 区分同一个数据库中的不同账号，单账号运行时为0。
+    """
 
-class WeiboRead(models.Model):
     id = fields.IntField(pk=True)
-    mid = fields.IntField()
+    account = fields.BigIntField(default=0)
+    mid = fields.BigIntField()
+    created_at = fields.DatetimeField(auto_now_add=True, db_index=True)
 
     class Meta:
-        table = "weibo_read"
+        abstract = True
 
     @classmethod
-    async def create_record(cls, mid: int) -> "WeiboRead":
-        """创建一条微博阅读记录"""
-        return await cls.create(mid=mid)
+    async def create_record(cls, mid: int, account: int = 0) -> "MidRecord":
+        """创建一条记录，已存在时直接返回原记录"""
+        record, _ = await cls.get_or_create(account=account, mid=mid)
+        return record
 
     @classmethod
-    async def get_by_mid(cls, mid: int) -> "WeiboRead":
-        """根据微博ID查询记录"""
-        return await cls.filter(mid=mid).first()
+    async def get_by_mid(cls, mid: int, account: int = 0) -> "MidRecord":
+        """根据mid查询记录"""
+        return await cls.filter(account=account, mid=mid).first()
 
+    @classmethod
+    async def get_existing_mids(cls, mids: Iterable[int], account: int = 0) -> Set[int]:
+        """一次查询出已经存在的mid
 
-class MentionCmtRead(models.Model):
-    id = fields.IntField(pk=True)
-    mid = fields.IntField()
+        Args:
+            mids (Iterable[int]): 待查询的mid
+            account (int): 账号
 
-    class Meta:
-        table = "mention_cmt_read"
+        Returns:
+            Set[int]: 其中已经有记录的mid
+        """
+        mids = {int(mid) for mid in mids}
+        if not mids:
+            return set()
+        rows = await cls.filter(account=account, mid__in=mids).values_list(
+            "mid", flat=True
+        )
+        return set(rows)
 
     @classmethod
-    async def create_record(cls, mid: int) -> "MentionCmtRead":
-        """创建一条@评论阅读记录"""
-        return await cls.create(mid=mid)
+    async def bulk_create_records(
+        cls, mids: Iterable[int], account: int = 0
+    ) -> List["MidRecord"]:
+        """在一个事务中批量创建记录，已存在的mid会被忽略
+
+        Args:
+            mids (Iterable[int]): 待写入的mid
+            account (int): 账号
+
+        Returns:
+            List[MidRecord]: 创建的记录
+        """
+        mids = list(dict.fromkeys(int(mid) for mid in mids))
+        if not mids:
+            return []
+        records = [cls(account=account, mid=mid) for mid in mids]
+        async with in_transaction():
+            await cls.bulk_create(records, ignore_conflicts=True)
+        return records
 
     @classmethod
-    async def get_by_mid(cls, mid: int) -> "MentionCmtRead":
-        """根据@评论ID查询记录"""
-        return await cls.filter(mid=mid).first()
+    async def prune(cls, before: datetime, account: Optional[int] = None) -> int:
+        """删除早于指定时间的记录
 
+        Args:
+            before (datetime): 截止时间
+            account (Optional[int]): 只清理该账号的记录，None表示所有账号
 
-class WeiboRepost(models.Model):
-    id = fields.IntField(pk=True)
-    mid = fields.IntField()
+        Returns:
+            int: 删除的记录数
+        """
+        query = cls.filter(created_at__lt=before)
+        if account is not None:
+            query = query.filter(account=account)
+        return await query.delete()
+
+
+class WeiboRead(MidRecord):
+    """微博阅读记录"""
+
+    class Meta:
+        table = "weibo_read"
+        unique_together = (("account", "mid"),)
+
+
+class MentionCmtRead(MidRecord):
+    """@评论阅读记录"""
+
+    class Meta:
+        table = "mention_cmt_read"
+        unique_together = (("account", "mid"),)
+
+
+class WeiboRepost(MidRecord):
+    """微博转发记录"""
 
     class Meta:
         table = "weibo_repost"
+        unique_together = (("account", "mid"),)
+
+
+class BotState(models.Model):
+    """按账号保存的键值状态"""
+
+    id = fields.IntField(pk=True)
+    account = fields.BigIntField(default=0)
+    key = fields.CharField(max_length=128)
+    value = fields.TextField()
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "bot_state"
+        unique_together = (("account", "key"),)
 
     @classmethod
-    async def create_record(cls, mid: int) -> "WeiboRepost":
-        """创建一条微博转发记录"""
-        return await cls.create(mid=mid)
+    async def get_value(cls, key: str, account: int = 0) -> Optional[str]:
+        """读取状态，不存在时返回None"""
+        state = await cls.filter(account=account, key=key).first()
+        return state.value if state else None
 
     @classmethod
-    async def get_by_mid(cls, mid: int) -> "WeiboRepost":
-        """根据微博ID查询记录"""
-        return await cls.filter(mid=mid).first()
+    async def set_value(cls, key: str, value: str, account: int = 0):
+        """写入状态，已存在时覆盖"""
+        await cls.update_or_create(defaults={"value": value}, account=account, key=key)
+
+
+class CacheEntry(models.Model):
+    """持久化的接口响应缓存"""
+
+    id = fields.IntField(pk=True)
+    key = fields.CharField(max_length=255, unique=True)
+    value = fields.TextField()
+    expires_at = fields.FloatField(db_index=True)
+
+    class Meta:
+        table = "response_cache"
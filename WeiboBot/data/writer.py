@@ -0,0 +1,68 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from loguru import logger
+
+from .record import MidRecord
+
+
+class RecordWriter:
+    """后台写入队列，把零散的 mark_* 写入合并成周期性的批量事务"""
+
+    def __init__(self, flush_interval: float = 1.0, max_batch: int = 500):
+        """
+        Args:
+            flush_interval (float): 定时写入间隔（秒）
+            max_batch (int): 单张表积压达到此数量时立即写入
+        """
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending: Dict[Tuple[Type[MidRecord], int], List[int]] = defaultdict(list)
+        self._task: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    def put(self, model: Type[MidRecord], mid: int, account: int = 0):
+        self.put_many(model, [mid], account)
+
+    def put_many(self, model: Type[MidRecord], mids: Iterable[int], account: int = 0):
+        pending = self._pending[(model, account)]
+        pending.extend(int(mid) for mid in mids)
+        if len(pending) >= self.max_batch:
+            task = asyncio.get_running_loop().create_task(self.flush())
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def flush(self):
+        """把积压的记录写入数据库"""
+        async with self._lock:
+            pending, self._pending = self._pending, defaultdict(list)
+            for (model, account), mids in pending.items():
+                if not mids:
+                    continue
+                try:
+                    await model.bulk_create_records(mids, account)
+                except Exception as e:
+                    logger.error(f"批量写入{model.__name__}失败: {e}")
+                    self._pending[(model, account)].extend(mids)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        """停止后台任务并写入剩余记录"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
@@ -32,3 +32,12 @@ class LikeWeiboError(Exception):
 
 class RepostWeiboError(Exception):
     pass
+
+
+class CircuitOpenError(Exception):
+    """熔断期间拒绝发送请求"""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"{host} 暂时不可用，{retry_after:.1f}秒后重试")
+        self.host = host
+        self.retry_after = retry_after
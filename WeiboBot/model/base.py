@@ -1,6 +1,35 @@
+import inspect
+from typing import Any, Union, get_args, get_origin
+
 from pydantic import BaseModel, Field
 
 
+def _construct_value(annotation: Any, value: Any) -> Any:
+    """按字段类型把嵌套的原始数据构造成模型，其余的值原样返回"""
+    if value is None:
+        return None
+    origin = get_origin(annotation)
+    if origin is Union:
+        for arg in get_args(annotation):
+            constructed = _construct_value(arg, value)
+            if constructed is not value:
+                return constructed
+        return value
+    if origin is list and isinstance(value, list):
+        (item_type,) = get_args(annotation) or (Any,)
+        return [_construct_value(item_type, item) for item in value]
+    if origin is dict and isinstance(value, dict):
+        _, value_type = get_args(annotation) or (Any, Any)
+        return {key: _construct_value(value_type, item) for key, item in value.items()}
+    if (
+        inspect.isclass(annotation)
+        and issubclass(annotation, MetaBaseModel)
+        and isinstance(value, dict)
+    ):
+        return annotation.model_construct_trusted(value)
+    return value
+
+
 class MetaBaseModel(BaseModel):
     metadata: dict = Field(default_factory=dict, description="原始数据")
 
@@ -9,3 +38,25 @@ class MetaBaseModel(BaseModel):
         obj = super().model_validate(data)
         obj.metadata = data
         return obj
+
+    @classmethod
+    def model_construct_trusted(cls, data: dict):
+        """跳过校验，直接用原始数据构造模型
+
+        只用于已经通过一次 model_validate 的数据，例如响应缓存中的数据。
+        嵌套的模型同样直接构造，字段值不做类型转换，保持原始数据的类型。
+
+        Args:
+            data (dict): 接口返回的原始数据
+
+        Returns:
+            模型实例，metadata 为原始数据
+        """
+        values = {}
+        for name, field in cls.model_fields.items():
+            key = field.alias or name
+            if key in data:
+                values[name] = _construct_value(field.annotation, data[key])
+        obj = cls.model_construct(**values)
+        obj.metadata = data
+        return obj
@@ -25,6 +25,7 @@ class Comment(MetaBaseModel):
     is_followed: bool = Field(False, description="是否已关注评论用户")
     user: "User" = Field(None, description="评论用户")
     comments: Union[List["Comment"], None, bool] = Field(None, description="子评论列表")
+    total_number: int = Field(0, description="回复数")
     status: "Weibo" = Field(None, description="微博状态")
 
     class Config:
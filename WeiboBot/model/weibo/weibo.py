@@ -1,6 +1,7 @@
-from typing import TYPE_CHECKING, List, Optional
+import asyncio
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from ..base import MetaBaseModel
 
@@ -37,6 +38,39 @@ class Weibo(MetaBaseModel):
 
     metadata: Optional[dict] = Field(default=None, description="原始数据")
 
+    # 按需获取详情用的 NetTool，以及已获取内容的缓存
+    _client: Any = PrivateAttr(default=None)
+    _memo: Dict[Any, asyncio.Future] = PrivateAttr(default_factory=dict)
+
+    def bind(self, client) -> "Weibo":
+        """绑定 NetTool，之后可以用 fetch_* 方法按需获取详情，被转发的微博一并绑定
+
+        Args:
+            client (NetTool): 用于发送请求的 NetTool
+
+        Returns:
+            Weibo: 自身
+        """
+        self._client = client
+        if self.retweeted_status is not None:
+            self.retweeted_status.bind(client)
+        return self
+
+    async def _once(self, key: Any, factory: Callable[[], Awaitable]) -> Any:
+        """同一个 key 只获取一次，并发访问时共用同一个请求，失败时不缓存"""
+        if self._client is None:
+            raise RuntimeError("微博未绑定 NetTool，请先调用 bind")
+        future = self._memo.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._memo[key] = future
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            if self._memo.get(key) is future:
+                del self._memo[key]
+            raise
+
     def detail_url(self) -> str:
         """获取微博详情页URL"""
         return f"https://m.weibo.cn/detail/{self.id}"
@@ -48,6 +82,48 @@ class Weibo(MetaBaseModel):
         else:
             return self.text
 
+    async def fetch_full_text(self) -> str:
+        """获取完整文本内容，长微博只在第一次调用时请求全文"""
+        if not self.isLongText or self.longText:
+            return self.full_text()
+
+        async def fetch():
+            text = await self._client.weibo_long_text(self.id)
+            self.longText = {"longTextContent": text}
+            return text
+
+        return await self._once("full_text", fetch)
+
+    async def fetch_comments(self, count: int = 20) -> List["Comment"]:
+        """获取评论，同样的数量只请求一次
+
+        Args:
+            count (int): 获取评论数量，-1表示获取所有评论
+
+        Returns:
+            List[Comment]: 评论列表，同时保存到 comments
+        """
+
+        async def fetch():
+            self.comments = await self._client.get_weibo_comments(self.id, count)
+            return self.comments
+
+        return await self._once(("comments", count), fetch)
+
+    async def fetch_retweeted(self) -> Optional["Weibo"]:
+        """获取被转发微博的完整信息，不是转发微博时返回None"""
+        if self.retweeted_status is None:
+            return None
+
+        async def fetch():
+            retweeted = await self._client.weibo_info(
+                self.retweeted_status.id, lazy=True
+            )
+            self.retweeted_status = retweeted
+            return retweeted
+
+        return await self._once("retweeted", fetch)
+
     def weibo_id(self) -> int:
         """获取微博ID（整数形式）"""
         return int(self.id)
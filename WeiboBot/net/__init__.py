@@ -1,3 +1,24 @@
 from .net_tool import NetTool
+from .ratelimit import RateLimiter, TokenBucket, get_rate_limiter, set_rate_limiter
+from .retry import CircuitBreaker, RetryPolicy, get_circuit_breaker
+from .transport import (
+    DEFAULT_LIMITS,
+    DEFAULT_TIMEOUT,
+    SharedTransport,
+    create_transport,
+)
 
-__all__ = ["NetTool"]
+__all__ = [
+    "NetTool",
+    "RateLimiter",
+    "TokenBucket",
+    "get_rate_limiter",
+    "set_rate_limiter",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "get_circuit_breaker",
+    "SharedTransport",
+    "create_transport",
+    "DEFAULT_LIMITS",
+    "DEFAULT_TIMEOUT",
+]
@@ -0,0 +1,72 @@
+import json
+import re
+
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from WeiboBot.exception import WeiboNotExist
+
+RENDER_DATA_MARKER = "render_data = ["
+NOT_EXIST_TEXT = "微博不存在或暂无查看权限!"
+
+_RENDER_DATA_RE = re.compile(r"render_data\s*=\s*\[")
+_WHITESPACE_RE = re.compile(r"\s*")
+_decoder = json.JSONDecoder()
+
+
+def _decode_at(html: str, index: int) -> dict:
+    """从 index 处解码一个JSON对象，只扫描它本身的长度"""
+    # 只跳过空白，不能越过数组去匹配后面的 "|| {}"
+    index = _WHITESPACE_RE.match(html, index).end()
+    if not html.startswith("{", index):
+        raise ValueError("render_data 中没有JSON对象")
+    data, _ = _decoder.raw_decode(html, index)
+    return data
+
+
+def _legacy_extract(html: str) -> dict:
+    """旧的整页解析方式，只在页面结构变化导致快速路径失败时使用"""
+    soup = BeautifulSoup(html, "html.parser")
+    error_msg = soup.select_one("body > div > p")
+    if error_msg and error_msg.get_text().strip() == NOT_EXIST_TEXT:
+        raise WeiboNotExist(NOT_EXIST_TEXT)
+    found = re.findall(r"(?<=render_data = \[)[\s\S]*(?=\]\[0\])", html)
+    if not found:
+        raise ValueError("详情页中没有 render_data")
+    return json.loads(found[0])
+
+
+def extract_render_data(html: str) -> dict:
+    """从微博详情页中取出 render_data[0]
+
+    先用 str.find 定位标记，再用 raw_decode 只解码JSON本身，不构建DOM；
+    标记格式变化时用正则重新定位，仍失败时退回整页解析。
+
+    Args:
+        html (str): /detail/{mid} 的页面
+
+    Returns:
+        dict: render_data[0]，其中 status 是微博数据
+
+    Raises:
+        WeiboNotExist: 微博不存在或没有查看权限
+        ValueError: 页面中找不到 render_data
+    """
+    index = html.find(RENDER_DATA_MARKER)
+    if index != -1:
+        try:
+            return _decode_at(html, index + len(RENDER_DATA_MARKER))
+        except ValueError:
+            pass
+    else:
+        match = _RENDER_DATA_RE.search(html)
+        if match:
+            try:
+                return _decode_at(html, match.end())
+            except ValueError:
+                pass
+        elif NOT_EXIST_TEXT in html:
+            # 错误页很短，没有 render_data 时才检查
+            raise WeiboNotExist(NOT_EXIST_TEXT)
+    logger.warning("详情页结构可能已变化，使用整页解析")
+    return _legacy_extract(html)
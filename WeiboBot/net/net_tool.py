@@ -1,17 +1,30 @@
 import asyncio
 import json
-import re
 import time
+from contextlib import aclosing
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import httpx
 import qrcode
-from bs4 import BeautifulSoup
 from loguru import logger
 
 import WeiboBot.const as const
 from WeiboBot.exception import (
+    CircuitOpenError,
     CommentError,
     DeleteCommentError,
     DeleteWeiboError,
@@ -22,31 +35,86 @@ from WeiboBot.exception import (
     UploadPicError,
     WeiboNotExist,
 )
-from WeiboBot.model import Chat, ChatDetail, Comment, Page, User, Weibo
+from WeiboBot.model import Chat, ChatDetail, Comment, Message, Page, User, Weibo
+from WeiboBot.net.extract import extract_render_data
+from WeiboBot.net.paging import first_error, iter_items, merge_streams, prefetch_pages
+from WeiboBot.net.ratelimit import RateLimiter, get_rate_limiter
+from WeiboBot.net.retry import RETRY_STATUSES, RetryPolicy, get_circuit_breaker
+from WeiboBot.net.transport import DEFAULT_TIMEOUT, create_transport
 from WeiboBot.typing import CID, MID
 from WeiboBot.util import (
+    CookieStore,
+    FileCookieStore,
+    ResponseCache,
+    SingleFlight,
+    copy_json,
     get_cookies_value,
     httpx_cookies_to_playwright,
-    load_cookies,
-    save_cookies,
+    parse_weibo_time,
 )
 
+BASE_HEADERS = {"Referer": "https://m.weibo.cn/"}
+
+# 批量过滤已读ID：传入ID，返回其中未读的，例如 SeenIndex.filter_unseen
+UnseenFilter = Callable[[Iterable[int]], Awaitable[Set[int]]]
+
 
 class NetTool:
     def __init__(
-        self, cookies: Union[str, dict, Path] = Path("weibobot_cookies.json")
+        self,
+        cookies: Union[str, dict, Path, CookieStore] = Path("weibobot_cookies.json"),
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        http2: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
     ) -> None:
         """初始化网络工具类。
 
         Args:
-            cookies (str): 微博的cookies字符串
+            cookies (Union[str, dict, Path, CookieStore]): 微博的cookies，
+                可以是JSON字符串、字典、cookies文件路径或自定义的 CookieStore，
+                后两种会在cookies变化时自动保存
+            transport (httpx.AsyncBaseTransport, optional): 自定义的连接池，
+                多个客户端共用时请用 SharedTransport 包装，此时忽略 limits 和 http2
+            limits (httpx.Limits, optional): 连接数和长连接保持时间，默认 DEFAULT_LIMITS
+            timeout (httpx.Timeout, optional): 连接/读/写/等待连接池的超时，
+                默认 DEFAULT_TIMEOUT
+            http2 (bool): 是否启用HTTP/2，需要安装 WeiboBot[http2]
+            rate_limiter (RateLimiter, optional): 请求限速器，
+                默认使用同一账号共用的限速器，见 get_rate_limiter
+            retry_policy (RetryPolicy, optional): 幂等GET请求遇到超时、5xx或429时的重试策略
+            cache (ResponseCache, optional): user_info、weibo_info 和
+                get_weibo_comments 的响应缓存，默认不缓存
         """
         super(NetTool, self).__init__()
-        self.client = httpx.AsyncClient(max_redirects=10)
+        if transport is None:
+            transport = create_transport(limits, http2)
+        self.client = httpx.AsyncClient(
+            max_redirects=10,
+            transport=transport,
+            timeout=timeout or DEFAULT_TIMEOUT,
+        )
         self.mid: int = 0
+        self.feed_interval: Optional[float] = None  # 服务端建议的关注页面刷新间隔（秒）
+        self._rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.cache = cache
+        self._flight = SingleFlight()
         self._last_refresh_token_time = 0
         self._token_refresh_interval = 60 * 10  # 10分钟
+        self._token_refresh_margin = 60  # 后台提前1分钟刷新
+        self._token = ""
+        self._headers = dict(BASE_HEADERS)
+        self._token_lock = asyncio.Lock()
+        self._token_refresher: Optional[asyncio.Task] = None
         self.cookies_path = cookies
+        self.cookie_store: Optional[CookieStore] = None
+        self._cookies_loaded = True
+        self._cookies_save_delay = 1.0
+        self._cookies_saver: Optional[asyncio.Task] = None
         if isinstance(cookies, str):
             logger.info("从字符串加载cookies")
             cookies_dict = json.loads(cookies)
@@ -58,20 +126,126 @@ class NetTool:
                 self.client.cookies.set(name, value)
         elif isinstance(cookies, Path):
             logger.info("从文件加载cookies")
-            if not load_cookies(cookies, self.client):
+            self.cookie_store = FileCookieStore(cookies)
+            cookies_dict = self.cookie_store.load_sync()
+            if cookies_dict is None:
                 logger.info("文件不存在，将使用扫码登录")
+            for name, value in (cookies_dict or {}).items():
+                self.client.cookies.set(name, value)
+        elif isinstance(cookies, CookieStore):
+            # 自定义存储可能依赖数据库等异步资源，在登录时再加载
+            self.cookie_store = cookies
+            self._cookies_loaded = False
 
     async def __aenter__(self):
         await self.login()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._token_refresher is not None:
+            self._token_refresher.cancel()
+            self._token_refresher = None
+        if self._cookies_saver is not None and not self._cookies_saver.done():
+            self._cookies_saver.cancel()
+            await self.save_cookies()
         await self.client.aclose()
 
+    def _cookies_dict(self) -> dict:
+        return {cookie.name: cookie.value for cookie in self.client.cookies.jar}
+
+    async def load_cookies(self):
+        """从 cookie_store 加载cookies"""
+        if self.cookie_store is None or self._cookies_loaded:
+            return
+        cookies_dict = await self.cookie_store.load()
+        for name, value in (cookies_dict or {}).items():
+            self.client.cookies.set(name, value)
+        self._cookies_loaded = True
+
+    async def save_cookies(self):
+        """立即保存cookies，内容没有变化时不会写入"""
+        if self.cookie_store is None:
+            return
+        try:
+            await self.cookie_store.save(self._cookies_dict())
+        except Exception as e:
+            logger.warning(f"保存cookies失败: {e}")
+
+    async def _save_cookies_later(self):
+        await asyncio.sleep(self._cookies_save_delay)
+        await self.save_cookies()
+
+    def _schedule_save_cookies(self):
+        """延迟保存cookies，短时间内的多次变化只写一次"""
+        if self.cookie_store is None:
+            return
+        if self._cookies_saver is None or self._cookies_saver.done():
+            self._cookies_saver = asyncio.get_running_loop().create_task(
+                self._save_cookies_later()
+            )
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        if self._rate_limiter is not None:
+            return self._rate_limiter
+        return get_rate_limiter(self.mid)
+
+    async def _cached(self, endpoint: str, key, fetch) -> Tuple[Any, bool]:
+        """获取只读接口的原始数据
+
+        先查响应缓存，未命中时同一接口、同一参数的并发调用只请求一次，
+        结果写入缓存。这是读接口唯一的合并层，每个调用方拿到各自的一份数据。
+
+        Args:
+            endpoint (str): 接口名，决定缓存时间
+            key (Any): 接口参数，与接口名一起组成缓存和合并的键
+            fetch (Callable[[], Awaitable[Any]]): 获取原始数据的协程函数
+
+        Returns:
+            Tuple[Any, bool]: 原始数据，以及它是否来自缓存。来自缓存的数据
+                已经校验过，可以用 model_construct_trusted 构造模型
+        """
+        if self.cache is not None:
+            data = await self.cache.get(endpoint, key)
+            if data is not None:
+                return data, True
+
+        async def fetch_and_store():
+            data = await fetch()
+            if self.cache is not None:
+                await self.cache.set(endpoint, key, data)
+            return data
+
+        flight_key = (endpoint, str(key))
+        owner = flight_key not in self._flight
+        data = await self._flight.do(flight_key, fetch_and_store)
+        # 发起请求的调用方直接使用结果，被合并的调用方各自复制一份
+        return (data if owner else copy_json(data)), False
+
+    async def _invalidate(self, endpoint: str, key):
+        if self.cache is not None:
+            await self.cache.invalidate(endpoint, key)
+
+    def _set_token(self, token: str):
+        """更新缓存的token和预先构造好的请求头"""
+        self._token = token
+        self._headers = {**BASE_HEADERS, "x-xsrf-token": token}
+
     async def _refresh_token(self):
-        response = await self.client.get(
-            "https://m.weibo.cn/api/config", headers={"Referer": "https://m.weibo.cn/"}
-        )
+        url = "https://m.weibo.cn/api/config"
+        # 不经过 _send（它需要token），但同样受熔断器和限速器约束
+        breaker = get_circuit_breaker(httpx.URL(url).host)
+        breaker.check()
+        await self.rate_limiter.acquire("GET", url)
+        try:
+            response = await self.client.get(url, headers=BASE_HEADERS)
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        if response.status_code in RETRY_STATUSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
         response.raise_for_status()
         for cookie in response.cookies.jar:
             logger.debug(
@@ -90,17 +264,193 @@ class NetTool:
         if result["data"]["login"]:
             token = result["data"]["st"]
             self.client.cookies.set("XSRF-TOKEN", token, domain="m.weibo.cn")
-            save_cookies(self.cookies_path, self.client)
+            self._set_token(token)
+            self._schedule_save_cookies()
 
-    async def get_token(self) -> str:
-        now = time.time()
-        if now - self._last_refresh_token_time > self._token_refresh_interval:
+    def _token_expired(self) -> bool:
+        age = time.time() - self._last_refresh_token_time
+        return age > self._token_refresh_interval
+
+    async def refresh_token(self, force: bool = False):
+        """刷新token，同一时间只会有一个刷新请求
+
+        等锁期间如果其他协程已经刷新过，就直接使用它的结果。
+
+        Args:
+            force (bool): 即使token未过期也刷新
+        """
+        seen = self._last_refresh_token_time
+        async with self._token_lock:
+            if self._last_refresh_token_time != seen:
+                return
+            if not force and not self._token_expired():
+                return
             await self._refresh_token()
-            self._last_refresh_token_time = now
-        return get_cookies_value(self.client, "XSRF-TOKEN")
+            self._last_refresh_token_time = time.time()
+
+    async def _refresh_token_loop(self):
+        # 连续失败时按指数退避，最长不超过token的有效期
+        policy = RetryPolicy(base_delay=1.0, max_delay=self._token_refresh_interval)
+        failures = 0
+        retry_after: Optional[float] = None
+        while True:
+            if retry_after is not None:
+                delay = retry_after
+            elif failures:
+                # 全抖动可能取到很小的值，下限保持为上限的一半
+                floor = min(policy.base_delay * 2 ** (failures - 1), policy.max_delay)
+                delay = max(policy.backoff(failures), floor)
+            else:
+                age = time.time() - self._last_refresh_token_time
+                delay = self._token_refresh_interval - self._token_refresh_margin - age
+            await asyncio.sleep(max(delay, 1))
+            retry_after = None
+            try:
+                await self.refresh_token(force=True)
+                failures = 0
+            except CircuitOpenError as e:
+                retry_after = e.retry_after
+                logger.warning(f"后台刷新token暂停: {e}")
+            except Exception as e:
+                failures += 1
+                logger.warning(f"后台刷新token失败(连续{failures}次): {e}")
+
+    def _start_token_refresher(self):
+        if self._token_refresher is None or self._token_refresher.done():
+            self._token_refresher = asyncio.get_running_loop().create_task(
+                self._refresh_token_loop()
+            )
+
+    async def get_token(self) -> str:
+        if self._token_expired():
+            await self.refresh_token()
+        if not self._token:
+            self._set_token(get_cookies_value(self.client, "XSRF-TOKEN"))
+        return self._token
+
+    @staticmethod
+    def _is_auth_error(response: httpx.Response) -> bool:
+        """判断是否是登录凭证失效导致的失败"""
+        if response.status_code == 403:
+            return True
+        # 这类错误的响应体很短，只检查开头即可
+        head = response.content[:256]
+        return b'"ok":-100' in head or b'"errno":"100006"' in head
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        with_st: bool = False,
+        retry: bool = False,
+        **kwargs,
+    ) -> httpx.Response:
+        """发送带登录信息的请求
+
+        Args:
+            method (str): 请求方法
+            url (str): 请求地址
+            params (dict, optional): 查询参数
+            data (dict, optional): 表单数据
+            with_st (bool): 是否附带st参数，有表单数据时放在表单中，否则放在查询参数中
+            retry (bool): 是否按 retry_policy 重试，只用于幂等请求
+            **kwargs: 其余参数传给 httpx
+
+        Returns:
+            httpx.Response: 状态码正常的响应
+
+        Raises:
+            CircuitOpenError: 目标主机处于熔断中
+        """
+        breaker = get_circuit_breaker(httpx.URL(url).host)
+        policy = self.retry_policy if retry else None
+        attempt = 0
+        # 上传的文件对象已被读取，不能重发
+        auth_retry = "files" not in kwargs
+        while True:
+            breaker.check()
+            token = await self.get_token()
+            request_params = params
+            if with_st:
+                if data is not None:
+                    data["st"] = token
+                else:
+                    request_params = {**(params or {}), "st": token}
+            await self.rate_limiter.acquire(method, url)
+            try:
+                response = await self.client.request(
+                    method,
+                    url,
+                    params=request_params,
+                    data=data,
+                    headers=self._headers,
+                    **kwargs,
+                )
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                if policy is None or attempt >= policy.attempts:
+                    raise
+                delay = policy.backoff(attempt)
+                attempt += 1
+                logger.warning(f"请求失败({e!r})，{delay:.1f}秒后第{attempt}次重试")
+                await asyncio.sleep(delay)
+                continue
+            if response.status_code in RETRY_STATUSES:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if auth_retry and self._is_auth_error(response):
+                logger.warning("登录凭证失效，刷新token后重试")
+                auth_retry = False
+                await self.refresh_token(force=True)
+                continue
+            if (
+                policy is not None
+                and response.status_code in policy.statuses
+                and attempt < policy.attempts
+            ):
+                delay = policy.backoff(attempt, policy.retry_after(response))
+                if delay <= policy.max_delay:
+                    attempt += 1
+                    logger.warning(
+                        f"请求返回{response.status_code}，{delay:.1f}秒后第{attempt}次重试"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+            response.raise_for_status()
+            return response
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        error: Optional[Type[Exception]] = None,
+        **kwargs,
+    ) -> dict:
+        """发送请求并解析JSON
+
+        Args:
+            method (str): 请求方法
+            url (str): 请求地址
+            error (Type[Exception], optional): 返回的ok不为1时抛出的异常类型
+            **kwargs: 其余参数见 _send
+
+        Returns:
+            dict: 响应JSON
+        """
+        response = await self._send(method, url, **kwargs)
+        result = response.json()
+        if error is not None and result.get("ok") != 1:
+            raise error(result.get("msg", ""))
+        return result
 
     async def login(self) -> int:
         """登录微博。"""
+        await self.load_cookies()
         if not self.client.cookies:
             await self.login_by_qr_code()
             return await self.check_login_status()
@@ -178,7 +528,7 @@ class NetTool:
                     alt, follow_redirects=True, headers=headers
                 )
                 final_response.raise_for_status()
-                save_cookies(self.cookies_path, self.client)
+                await self.save_cookies()
                 # 此时，client.cookies 中包含了登录后的 Cookies
                 return
 
@@ -197,7 +547,9 @@ class NetTool:
             return 0
         token = data["data"]["st"]
         self.client.cookies.set("XSRF-TOKEN", token)
+        self._set_token(token)
         self._last_refresh_token_time = time.time()
+        self._start_token_refresher()
         self.mid = int(data["data"]["uid"])
         logger.info(f"登录成功，用户ID: {self.mid}")
         return self.mid
@@ -211,22 +563,24 @@ class NetTool:
         Returns:
             User: 用户信息
         """
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
-        }
-        params = {
-            "uid": int(user_id),
-        }
-        response = await self.client.get(
-            "https://m.weibo.cn/profile/info", params=params, headers=headers
-        )
-        response.raise_for_status()
-        result = response.json()
-        user = User.model_validate(result["data"]["user"])
-        user.statuses = [
-            Weibo.model_validate(weibo) for weibo in result["data"]["statuses"]
-        ]
+
+        async def fetch():
+            result = await self._request(
+                "GET",
+                "https://m.weibo.cn/profile/info",
+                params={"uid": int(user_id)},
+                retry=True,
+            )
+            return result["data"]
+
+        data, trusted = await self._cached("user_info", int(user_id), fetch)
+        if trusted:
+            user = User.model_construct_trusted(data["user"])
+            weibos = [Weibo.model_construct_trusted(w) for w in data["statuses"]]
+        else:
+            user = User.model_validate(data["user"])
+            weibos = [Weibo.model_validate(w) for w in data["statuses"]]
+        user.statuses = [weibo.bind(self) for weibo in weibos]
         return user
 
     async def post_weibo(self, content: str, visible: const.VISIBLE) -> Optional[Weibo]:
@@ -242,23 +596,15 @@ class NetTool:
         params = {
             "content": content,
             "visible": visible.value,
-            "st": await self.get_token(),
-        }
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
         }
-        response = await self.client.post(
-            "https://m.weibo.cn/api/statuses/update", params=params, headers=headers
+        result = await self._request(
+            "POST",
+            "https://m.weibo.cn/api/statuses/update",
+            params=params,
+            with_st=True,
+            error=PostWeiboError,
         )
-        response.raise_for_status()
-        result = response.json()
-
-        if result["ok"] == 1:
-            weibo = Weibo.model_validate(result["data"])
-            return weibo
-        else:
-            raise PostWeiboError(result["msg"])
+        return Weibo.model_validate(result["data"]).bind(self)
 
     async def repost_weibo(
         self, mid: MID, content: str, dualPost: bool = False
@@ -277,56 +623,61 @@ class NetTool:
             "id": mid,
             "content": content,
             "mid": mid,
-            "st": await self.get_token(),
             "dualPost": int(dualPost),
         }
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
-        }
-        response = await self.client.post(
+        result = await self._request(
+            "POST",
             "https://m.weibo.cn/api/statuses/repost",
             params=params,
-            headers=headers,
+            with_st=True,
+            error=RepostWeiboError,
         )
-        response.raise_for_status()
-        result = response.json()
-        if result["ok"] == 1:
-            weibo = Weibo.model_validate(result["data"])
-            return weibo
-        else:
-            raise RepostWeiboError(result["msg"])
+        return Weibo.model_validate(result["data"]).bind(self)
 
-    async def weibo_info(self, mid: MID, comments_count: int = 0) -> Weibo:
+    async def weibo_info(
+        self, mid: MID, comments_count: int = 0, lazy: bool = False
+    ) -> Weibo:
         """获取微博详细信息。
 
         Args:
             mid (Union[str, int]): 微博ID
+            comments_count (int): 同时获取的评论数量
+            lazy (bool): 不预先获取评论，需要时用 Weibo.fetch_comments 获取
 
         Returns:
-            Weibo: 微博信息
+            Weibo: 微博信息，已绑定当前 NetTool
         """
-        url = f"https://m.weibo.cn/detail/{mid}"
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
-        }
-        response = await self.client.get(url, headers=headers)
-        response.raise_for_status()
-        r = response.text
-
-        soup = BeautifulSoup(r, "html.parser")
-        error_msg = soup.select_one("body > div > p")
-        if error_msg and error_msg.get_text().strip() == "微博不存在或暂无查看权限!":
-            raise WeiboNotExist(f"微博不存在或暂无查看权限! {mid}")
-
-        result = json.loads(
-            re.findall(r"(?<=render_data = \[)[\s\S]*(?=\]\[0\])", r)[0]
-        )["status"]
-        weibo = Weibo.model_validate(result)
-        weibo.comments = await self.get_weibo_comments(mid, comments_count)
+
+        async def fetch():
+            response = await self._send("GET", f"https://m.weibo.cn/detail/{mid}")
+            try:
+                return extract_render_data(response.text)["status"]
+            except WeiboNotExist:
+                raise WeiboNotExist(f"微博不存在或暂无查看权限! {mid}")
+
+        result, trusted = await self._cached("weibo_info", int(mid), fetch)
+        if trusted:
+            weibo = Weibo.model_construct_trusted(result).bind(self)
+        else:
+            weibo = Weibo.model_validate(result).bind(self)
+        if not lazy:
+            weibo.comments = await self.get_weibo_comments(mid, comments_count)
         return weibo
 
+    async def weibo_long_text(self, mid: MID) -> str:
+        """获取长微博的全文。
+
+        Args:
+            mid (Union[str, int]): 微博ID
+
+        Returns:
+            str: 全文HTML
+        """
+        result = await self._request(
+            "GET", "https://m.weibo.cn/statuses/extend", params={"id": mid}, retry=True
+        )
+        return result["data"]["longTextContent"]
+
     async def get_weibo_comments(self, mid: MID, count: int = 20) -> List[Comment]:
         """获取微博评论。
         Args:
@@ -335,44 +686,204 @@ class NetTool:
         Returns:
             List[Comment]: 评论列表
         """
-        comments = []
-        max_id = 0
         if count == 0:
             return []
-        while True:
-            url = "https://m.weibo.cn/comments/hotflow"
-            headers = {
-                "Referer": "https://m.weibo.cn/",
-                "x-xsrf-token": await self.get_token(),
-            }
+
+        async def fetch():
+            comments = []
+            async with aclosing(self._iter_weibo_comments_raw(mid)) as iterator:
+                async for data in iterator:
+                    comments.append(data)
+                    if len(comments) == count:
+                        break
+            return comments
+
+        data, cached = await self._cached(
+            "weibo_comments", f"{int(mid)}:{count}", fetch
+        )
+        # 未命中时只校验一次；命中的是缓存的副本，写入前已经校验过
+        if cached:
+            return [Comment.model_construct_trusted(comment) for comment in data]
+        return [Comment.model_validate(comment) for comment in data]
+
+    async def iter_weibo_comments(
+        self, mid: MID, prefetch: bool = True
+    ) -> AsyncIterator[Comment]:
+        """逐条获取微博评论，处理当前页时会提前请求下一页
+
+        提前停止时请用 contextlib.aclosing 包装，以便及时取消提前的请求。
+
+        Args:
+            mid (Union[str, int]): 微博ID
+            prefetch (bool): 是否提前请求下一页
+
+        Yields:
+            Comment: 评论，跨页重复的评论只返回一次
+        """
+        async with aclosing(self._iter_weibo_comments_raw(mid, prefetch)) as comments:
+            async for data in comments:
+                yield Comment.model_validate(data)
+
+    async def _iter_weibo_comments_raw(
+        self, mid: MID, prefetch: bool = True
+    ) -> AsyncIterator[dict]:
+        """逐条获取微博评论的原始数据，跨页重复的只返回一次"""
+
+        async def fetch(max_id: int):
             params = {
                 "id": mid,
                 "mid": mid,
                 "max_id": max_id,
                 "max_id_type": 0,
             }
+            result = await self._request(
+                "GET", "https://m.weibo.cn/comments/hotflow", params=params, retry=True
+            )
+            # 没有评论时不返回data
+            data = result.get("data") or {}
+            return data.get("data") or [], data.get("max_id") or None
+
+        seen = set()
+        async with aclosing(prefetch_pages(fetch, 0, prefetch)) as pages:
+            async for page in pages:
+                for data in page:
+                    if data["id"] in seen:
+                        continue
+                    seen.add(data["id"])
+                    yield data
+
+    async def iter_comment_replies(
+        self, cid: CID, prefetch: bool = True
+    ) -> AsyncIterator[Comment]:
+        """逐条获取一条评论下的全部回复
 
-            response = await self.client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            result = response.json()
+        Args:
+            cid (Union[str, int]): 评论ID
+            prefetch (bool): 是否提前请求下一页
 
-            if not comments:  # 第一次请求
-                total = result["data"]["total_number"]
-                if count != -1:
-                    count = min(count, total)
+        Yields:
+            Comment: 回复，跨页重复的只返回一次
+        """
 
-            new_comments = [
-                Comment.model_validate(data)
-                for data in result["data"]["data"]
-                if data["id"] not in [c.id for c in comments]
-            ]
-            comments.extend(new_comments)
+        async def fetch(max_id: int):
+            params = {"cid": cid, "max_id": max_id, "max_id_type": 0}
+            result = await self._request(
+                "GET",
+                "https://m.weibo.cn/comments/hotFlowChild",
+                params=params,
+                retry=True,
+            )
+            return result.get("data") or [], result.get("max_id") or None
+
+        seen = set()
+        async with aclosing(prefetch_pages(fetch, 0, prefetch)) as pages:
+            async for page in pages:
+                for data in page:
+                    if data["id"] in seen:
+                        continue
+                    seen.add(data["id"])
+                    yield Comment.model_validate(data)
+
+    async def _expand_comment_threads(
+        self,
+        mid: MID,
+        concurrency: int,
+        flatten: bool,
+        max_replies: Optional[int] = None,
+    ) -> AsyncIterator[Comment]:
+        """并发展开微博下每条评论的回复，结果经有界队列交给调用方"""
+        # 树结构模式下队列中的每一项都带着整条回复，队列长度与并发数相同
+        queue: asyncio.Queue = asyncio.Queue(
+            maxsize=concurrency * 20 if flatten else concurrency
+        )
+        semaphore = asyncio.Semaphore(concurrency)
+        closing = asyncio.Event()
+        done = object()
 
-            max_id = result["data"]["max_id"]
-            if max_id == 0 or (count != -1 and len(comments) >= count):
-                break
+        async def expand(comment: Comment):
+            try:
+                replies = self.iter_comment_replies(comment.id, prefetch=False)
+                if flatten:
+                    async for reply in replies:
+                        await queue.put(reply)
+                else:
+                    comment.comments = []
+                    async with aclosing(replies):
+                        async for reply in replies:
+                            if len(comment.comments) == max_replies:
+                                break
+                            comment.comments.append(reply)
+                    await queue.put(comment)
+            finally:
+                semaphore.release()
+
+        async def drive():
+            try:
+                async with asyncio.TaskGroup() as group:
+                    async for comment in self.iter_weibo_comments(mid):
+                        has_replies = comment.total_number > 0 or bool(comment.comments)
+                        if flatten or not has_replies:
+                            if not has_replies:
+                                comment.comments = []
+                            await queue.put(comment)
+                        if has_replies:
+                            await semaphore.acquire()
+                            group.create_task(expand(comment))
+            except BaseExceptionGroup as e:
+                raise first_error(e)
+            finally:
+                # 调用方已经退出时不再需要结束标记，队列也可能已满
+                if not closing.is_set():
+                    await queue.put(done)
+
+        driver = asyncio.get_running_loop().create_task(drive())
+        try:
+            while (item := await queue.get()) is not done:
+                yield item
+            await driver
+        finally:
+            closing.set()
+            driver.cancel()
+            await asyncio.gather(driver, return_exceptions=True)
+
+    def iter_comment_threads(
+        self, mid: MID, concurrency: int = 4, max_replies: Optional[int] = None
+    ) -> AsyncIterator[Comment]:
+        """逐条获取微博的一级评论，每条评论的 comments 中是它的回复
+
+        各评论的回复并发获取，按完成顺序返回。每条正在获取或等待返回的评论
+        都在内存中保留它的完整回复，最多约 2 * concurrency 条；回复很多时
+        用 max_replies 限制每条保留的回复数，或者改用 iter_all_comments。
+        请求速率受限速器约束，可以在 RateLimiter 的 path_rates 中
+        为 /comments/hotFlowChild 单独限速。
+
+        Args:
+            mid (Union[str, int]): 微博ID
+            concurrency (int): 同时获取回复的评论数
+            max_replies (Optional[int]): 每条评论最多获取的回复数，None表示不限
+
+        Yields:
+            Comment: 带有回复的一级评论
+        """
+        return self._expand_comment_threads(
+            mid, concurrency, flatten=False, max_replies=max_replies
+        )
 
-        return comments if count == -1 else comments[:count]
+    def iter_all_comments(
+        self, mid: MID, concurrency: int = 4
+    ) -> AsyncIterator[Comment]:
+        """逐条获取微博的全部评论和回复，不保留树结构
+
+        每条一级评论会先于它的回复返回，不同评论的回复之间没有固定顺序。
+
+        Args:
+            mid (Union[str, int]): 微博ID
+            concurrency (int): 同时获取回复的评论数
+
+        Yields:
+            Comment: 一级评论或回复，回复的 reply_id 指向被回复的评论
+        """
+        return self._expand_comment_threads(mid, concurrency, flatten=True)
 
     async def upload_chat_file(self, tuid: MID, file: Path) -> str:
         """上传聊天文件。
@@ -385,19 +896,13 @@ class NetTool:
             str: 文件ID
         """
         files = {"file": (file.name, open(file, "rb"), "image/jpeg")}
-        data = {"tuid": tuid, "st": await self.get_token()}
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
-        }
-        response = await self.client.post(
+        result = await self._request(
+            "POST",
             "https://m.weibo.cn/api/chat/upload",
-            headers=headers,
-            data=data,
+            data={"tuid": tuid},
             files=files,
+            with_st=True,
         )
-        response.raise_for_status()
-        result = response.json()
         if "fids" not in result.get("data", {}):
             raise UploadPicError()
         return result["data"]["fids"]
@@ -412,19 +917,13 @@ class NetTool:
             str: 图片ID
         """
         files = {"pic": (file.name, open(file, "rb"), "image/jpeg")}
-        data = {"type": "json", "st": await self.get_token()}
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
-        }
-        response = await self.client.post(
+        result = await self._request(
+            "POST",
             "https://m.weibo.cn/api/statuses/uploadPic",
-            headers=headers,
-            data=data,
+            data={"type": "json"},
             files=files,
+            with_st=True,
         )
-        response.raise_for_status()
-        result = response.json()
         if "pic_id" not in result:
             raise UploadPicError()
         return result["pic_id"]
@@ -445,11 +944,6 @@ class NetTool:
         params = {
             "uid": int(uid),
             "content": content,
-            "st": await self.get_token(),
-        }
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
         }
         if file and file.exists():
             media_type = const.MEDIA.PHOTO.value
@@ -458,16 +952,14 @@ class NetTool:
             params["content"] = ""
             params["fids"] = fids
 
-        response = await self.client.post(
-            "https://m.weibo.cn/api/chat/send", params=params, headers=headers
+        result = await self._request(
+            "POST",
+            "https://m.weibo.cn/api/chat/send",
+            params=params,
+            with_st=True,
+            error=SendMessageError,
         )
-        response.raise_for_status()
-        result = response.json()
-        if result["ok"] == 1:
-            chat_detail = ChatDetail.model_validate(result["data"])
-            return chat_detail
-        else:
-            raise SendMessageError(result["msg"])
+        return ChatDetail.model_validate(result["data"])
 
     async def user_chat(
         self, uid: MID, since_id: int = 0, is_continuous=0
@@ -487,17 +979,17 @@ class NetTool:
             "since_id": since_id,
             "is_continuous": is_continuous,
         }
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
-        }
-        response = await self.client.get(
-            "https://m.weibo.cn/api/chat/list", params=params, headers=headers
-        )
-        response.raise_for_status()
 
-        data = response.json()
-        return ChatDetail.model_validate(data["data"])
+        async def fetch():
+            result = await self._request(
+                "GET", "https://m.weibo.cn/api/chat/list", params=params
+            )
+            return result["data"]
+
+        data, _ = await self._cached(
+            "user_chat", f"{int(uid)}:{since_id}:{is_continuous}", fetch
+        )
+        return ChatDetail.model_validate(data)
 
     async def chat_list(self, page: int = 1) -> List[Chat]:
         """获取聊天列表。
@@ -508,62 +1000,382 @@ class NetTool:
         Returns:
             List[Chat]: 聊天列表
         """
-        params = {"page": page}
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
-        }
-        response = await self.client.get(
-            "https://m.weibo.cn/message/msglist", params=params, headers=headers
+        result = await self._request(
+            "GET",
+            "https://m.weibo.cn/message/msglist",
+            params={"page": page},
+            retry=True,
         )
-        response.raise_for_status()
-        result = response.json()
         chat_list = [Chat.model_validate(chat) for chat in result["data"]]
         return chat_list
 
-    async def mentions_cmt(self, page: int = 1) -> List[Comment]:
+    async def mentions_cmt(
+        self, page: int = 1, unseen: Optional[UnseenFilter] = None
+    ) -> List[Comment]:
         """获取@我的评论。
 
         Args:
             page (int): 页码
+            unseen (Optional[UnseenFilter]): 先从原始数据中取出 mid 过滤，
+                只校验未读的评论
 
         Returns:
             List[Comment]: @我的评论列表
         """
-        params = {"page": page}
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
-        }
-        response = await self.client.get(
-            "https://m.weibo.cn/message/mentionsCmt", params=params, headers=headers
+        data = await self._request(
+            "GET",
+            "https://m.weibo.cn/message/mentionsCmt",
+            params={"page": page},
+            retry=True,
         )
-        response.raise_for_status()
-        data = response.json()
-        cmt_list = [Comment.model_validate(cmt) for cmt in data["data"]]
+        raw_list = data["data"]
+        if unseen is not None:
+            unread = await unseen(int(cmt["mid"]) for cmt in raw_list)
+            raw_list = [cmt for cmt in raw_list if int(cmt["mid"]) in unread]
+        cmt_list = [Comment.model_validate(cmt) for cmt in raw_list]
         return cmt_list
 
-    async def refresh_page(self, max_id: int = 0) -> Page:
+    async def refresh_page(self, max_id: int = 0, since_id: int = 0) -> Page:
         """刷新关注页面。
 
         Args:
-            max_id (Union[str, int]): 最大ID
+            max_id (Union[str, int]): 最大ID，用于向后翻页
+            since_id (Union[str, int]): 起始ID，只获取比它新的微博
 
         Returns:
             Page: 关注页面，注意里面的statuses不是完整微博，需要用weibo_info获取
         """
+        page = Page.model_validate(await self._fetch_feed_page(max_id, since_id))
+        for weibo in page.statuses:
+            weibo.bind(self)
+        return page
+
+    async def _fetch_feed_page(self, max_id: int = 0, since_id: int = 0) -> dict:
+        """获取关注页面的原始数据，并记录服务端建议的刷新间隔"""
         params = {"max_id": max_id}
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
-        }
-        response = await self.client.get(
-            "https://m.weibo.cn/feed/friends", params=params, headers=headers
+        if since_id:
+            params["since_id"] = since_id
+        result = await self._request(
+            "GET",
+            "https://m.weibo.cn/feed/friends",
+            params=params,
+            retry=True,
+        )
+        data = result["data"]
+        # interval 的单位是毫秒
+        interval = int(data.get("interval") or 0)
+        self.feed_interval = interval / 1000 if interval else None
+        return data
+
+    async def new_weibos_since(self, since_id: int, max_pages: int = 5) -> List[Weibo]:
+        """获取关注页面中比 since_id 新的微博
+
+        从最新一页开始向后翻页，遇到不比 since_id 新的微博、没有下一页或达到
+        max_pages 时停止，短时间内大量新微博也不会漏掉。
+
+        Args:
+            since_id (int): 上次看到的最新微博ID，为0时只获取第一页
+            max_pages (int): 最多翻页数
+
+        Returns:
+            List[Weibo]: 新微博，从新到旧排列
+        """
+        weibos, _ = await self.poll_feed(since_id, max_pages)
+        return weibos
+
+    async def poll_feed(
+        self,
+        since_id: int,
+        max_pages: int = 5,
+        unseen: Optional[UnseenFilter] = None,
+    ) -> Tuple[List[Weibo], int]:
+        """轮询关注页面，只为需要的微博构造模型
+
+        翻页方式同 new_weibos_since，但先只从原始数据中取出ID，
+        经 unseen 过滤掉已读的之后才校验剩下的微博。
+
+        Args:
+            since_id (int): 上次看到的最新微博ID，为0时只获取第一页
+            max_pages (int): 最多翻页数
+            unseen (Optional[UnseenFilter]): 过滤已读ID，None表示不过滤
+
+        Returns:
+            Tuple[List[Weibo], int]: 未读的新微博（从新到旧排列），以及
+                本次看到的最新微博ID，没有新微博时为 since_id
+        """
+        statuses: Dict[int, dict] = {}
+        max_id = 0
+        for _ in range(max_pages):
+            data = await self._fetch_feed_page(max_id, since_id if not max_id else 0)
+            page = data.get("statuses") or []
+            newer = [status for status in page if int(status["id"]) > since_id]
+            for status in newer:
+                statuses.setdefault(int(status["id"]), status)
+            if not since_id or not newer or len(newer) < len(page):
+                break
+            max_id = int(data.get("max_id") or 0)
+            if not max_id:
+                break
+        else:
+            logger.warning(f"新微博超过{max_pages}页，更早的部分已跳过")
+        newest = max(statuses, default=since_id)
+        if unseen is not None and statuses:
+            unread = await unseen(statuses)
+            statuses = {mid: s for mid, s in statuses.items() if mid in unread}
+        weibos = [
+            Weibo.model_validate(status).bind(self) for status in statuses.values()
+        ]
+        return weibos, newest
+
+    def iter_feed(
+        self,
+        max_id: int = 0,
+        max_items: Optional[int] = None,
+        max_age: Optional[float] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Weibo]:
+        """从新到旧逐条获取关注页面的微博
+
+        Args:
+            max_id (int): 从这个ID开始向后翻页，0表示从最新开始
+            max_items (Optional[int]): 最多返回的条数
+            max_age (Optional[float]): 只返回这么多秒以内发布的微博
+            prefetch (bool): 是否提前请求下一页
+
+        Yields:
+            Weibo: 微博，注意不是完整微博，需要用weibo_info获取
+        """
+
+        async def fetch(cursor: int):
+            data = await self._fetch_feed_page(cursor)
+            return data.get("statuses") or [], data.get("max_id") or None
+
+        return iter_items(
+            prefetch_pages(fetch, max_id, prefetch),
+            lambda data: Weibo.model_validate(data).bind(self),
+            key=lambda data: data["id"],
+            max_items=max_items,
+            max_age=max_age,
+        )
+
+    def iter_mentions_cmt(
+        self,
+        max_items: Optional[int] = None,
+        max_age: Optional[float] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Comment]:
+        """从新到旧逐条获取@我的评论
+
+        Args:
+            max_items (Optional[int]): 最多返回的条数
+            max_age (Optional[float]): 只返回这么多秒以内的评论
+            prefetch (bool): 是否提前请求下一页
+
+        Yields:
+            Comment: @我的评论
+        """
+
+        async def fetch(page: int):
+            result = await self._request(
+                "GET",
+                "https://m.weibo.cn/message/mentionsCmt",
+                params={"page": page},
+                retry=True,
+            )
+            items = result.get("data") or []
+            return items, page + 1 if items else None
+
+        return iter_items(
+            prefetch_pages(fetch, 1, prefetch),
+            Comment.model_validate,
+            key=lambda data: data["id"],
+            max_items=max_items,
+            max_age=max_age,
+        )
+
+    def iter_chat_list(
+        self,
+        max_items: Optional[int] = None,
+        max_age: Optional[float] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Chat]:
+        """按最近消息从新到旧逐个获取聊天
+
+        Args:
+            max_items (Optional[int]): 最多返回的个数
+            max_age (Optional[float]): 只返回这么多秒以内有消息的聊天
+            prefetch (bool): 是否提前请求下一页
+
+        Yields:
+            Chat: 聊天
+        """
+
+        async def fetch(page: int):
+            result = await self._request(
+                "GET",
+                "https://m.weibo.cn/message/msglist",
+                params={"page": page},
+                retry=True,
+            )
+            items = result.get("data") or []
+            return items, page + 1 if items else None
+
+        return iter_items(
+            prefetch_pages(fetch, 1, prefetch),
+            Chat.model_validate,
+            key=lambda data: data["scheme"],
+            max_items=max_items,
+            max_age=max_age,
+        )
+
+    def iter_chat_history(
+        self,
+        uid: MID,
+        max_items: Optional[int] = None,
+        max_age: Optional[float] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Message]:
+        """从新到旧逐条获取与指定用户的聊天记录
+
+        Args:
+            uid (Union[str, int]): 用户ID
+            max_items (Optional[int]): 最多返回的条数
+            max_age (Optional[float]): 只返回这么多秒以内的消息
+            prefetch (bool): 是否提前请求下一页
+
+        Yields:
+            Message: 消息
+        """
+
+        async def fetch(since_id: int):
+            params = {
+                "count": 20,
+                "uid": int(uid),
+                "since_id": since_id,
+                "is_continuous": 1 if since_id else 0,
+            }
+            result = await self._request(
+                "GET", "https://m.weibo.cn/api/chat/list", params=params
+            )
+            msgs = (result.get("data") or {}).get("msgs") or []
+            msgs = sorted(msgs, key=lambda msg: int(msg["id"]), reverse=True)
+            # 以本页最早的消息为游标继续向前翻页
+            oldest = int(msgs[-1]["id"]) if msgs else 0
+            if not oldest or oldest == since_id:
+                return msgs, None
+            return msgs, oldest
+
+        return iter_items(
+            prefetch_pages(fetch, 0, prefetch),
+            Message.model_validate,
+            key=lambda data: data["id"],
+            max_items=max_items,
+            max_age=max_age,
+        )
+
+    def iter_user_weibos(
+        self,
+        uid: MID,
+        since_id: int = 0,
+        max_items: Optional[int] = None,
+        max_age: Optional[float] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Weibo]:
+        """从新到旧逐条获取用户主页的微博
+
+        置顶微博不按时间排列，只在满足 since_id 和 max_age 时返回，不会提前结束翻页。
+
+        Args:
+            uid (Union[str, int]): 用户ID
+            since_id (int): 只返回比这个ID新的微博，用于从上次的位置继续
+            max_items (Optional[int]): 最多返回的条数
+            max_age (Optional[float]): 只返回这么多秒以内发布的微博
+            prefetch (bool): 是否提前请求下一页
+
+        Yields:
+            Weibo: 微博，注意不是完整微博，需要用weibo_info获取
+        """
+        deadline = time.time() - max_age if max_age is not None else None
+
+        def wanted(mblog: dict) -> bool:
+            if int(mblog["id"]) <= since_id:
+                return False
+            created_at = parse_weibo_time(mblog.get("created_at", ""))
+            return (
+                deadline is None
+                or created_at is None
+                or created_at.timestamp() >= deadline
+            )
+
+        async def fetch(cursor: str):
+            params = {"containerid": f"107603{int(uid)}"}
+            if cursor:
+                params["since_id"] = cursor
+            result = await self._request(
+                "GET",
+                "https://m.weibo.cn/api/container/getIndex",
+                params=params,
+                retry=True,
+            )
+            data = result.get("data") or {}
+            mblogs = []
+            for card in data.get("cards") or []:
+                mblog = card.get("mblog")
+                if card.get("card_type") != 9 or not mblog:
+                    continue
+                if mblog.get("isTop") and not wanted(mblog):
+                    continue
+                mblogs.append(mblog)
+            next_cursor = (data.get("cardlistInfo") or {}).get("since_id")
+            if not mblogs:
+                next_cursor = None
+            return mblogs, str(next_cursor) if next_cursor else None
+
+        return iter_items(
+            prefetch_pages(fetch, "", prefetch),
+            lambda data: Weibo.model_validate(data).bind(self),
+            key=lambda mblog: mblog["id"],
+            max_items=max_items,
+            max_age=max_age,
+            until=lambda mblog: not mblog.get("isTop") and int(mblog["id"]) <= since_id,
+        )
+
+    def crawl_user_weibos(
+        self,
+        uids: Iterable[MID],
+        since_ids: Optional[Dict[int, int]] = None,
+        concurrency: int = 4,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[int, Weibo]]:
+        """并发获取多个用户主页的微博，按到达顺序逐条返回
+
+        所有请求共用同一账号的限速器，并发数只决定同时翻页的用户数。
+
+        Args:
+            uids (Iterable[Union[str, int]]): 用户ID
+            since_ids (Optional[Dict[int, int]]): 各用户上次获取到的最新微博ID
+            concurrency (int): 同时获取的用户数
+            **kwargs: 其余参数见 iter_user_weibos
+
+        Yields:
+            Tuple[int, Weibo]: 用户ID和微博
+        """
+        since_ids = since_ids or {}
+
+        def source(uid: int):
+            async def stream():
+                since_id = since_ids.get(uid, 0)
+                async with aclosing(
+                    self.iter_user_weibos(uid, since_id, **kwargs)
+                ) as weibos:
+                    async for weibo in weibos:
+                        yield uid, weibo
+
+            return stream
+
+        return merge_streams(
+            [source(int(uid)) for uid in uids], concurrency=concurrency
         )
-        response.raise_for_status()
-        result = response.json()
-        page = Page.model_validate(result["data"])
-        return page
 
     async def like_weibo(self, mid: MID) -> bool:
         """点赞微博。
@@ -577,21 +1389,16 @@ class NetTool:
         params = {
             "id": mid,
             "attitude": "heart",
-            "st": await self.get_token(),
         }
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
-        }
-        response = await self.client.post(
-            "https://m.weibo.cn/api/attitudes/create", params=params, headers=headers
+        await self._request(
+            "POST",
+            "https://m.weibo.cn/api/attitudes/create",
+            params=params,
+            with_st=True,
+            error=LikeWeiboError,
         )
-        response.raise_for_status()
-        result = response.json()
-        if result["ok"] == 1:
-            return True
-        else:
-            raise LikeWeiboError(result["msg"])
+        await self._invalidate("weibo_info", int(mid))
+        return True
 
     async def del_weibo(self, mid: MID) -> bool:
         """删除微博。
@@ -602,20 +1409,15 @@ class NetTool:
         Returns:
             bool: 删除结果
         """
-        params = {"mid": mid, "st": await self.get_token()}
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
-        }
-        response = await self.client.post(
-            "https://m.weibo.cn/profile/delMyblog", params=params, headers=headers
+        await self._request(
+            "POST",
+            "https://m.weibo.cn/profile/delMyblog",
+            params={"mid": mid},
+            with_st=True,
+            error=DeleteWeiboError,
         )
-        response.raise_for_status()
-        result = response.json()
-        if result["ok"] == 1:
-            return True
-        else:
-            raise DeleteWeiboError(result["msg"])
+        await self._invalidate("weibo_info", int(mid))
+        return True
 
     async def comment_weibo(
         self, mid: MID, content: str, file: Optional[Path] = None
@@ -634,26 +1436,20 @@ class NetTool:
             "id": mid,
             "mid": mid,
             "content": content,
-            "st": await self.get_token(),
         }
 
         if file and file.exists():
             pic_id = await self.upload_comment_pic(file=file)
             params["picId"] = pic_id
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
-        }
-        response = await self.client.post(
-            "https://m.weibo.cn/api/comments/create", params=params, headers=headers
+        result = await self._request(
+            "POST",
+            "https://m.weibo.cn/api/comments/create",
+            params=params,
+            with_st=True,
+            error=CommentError,
         )
-        response.raise_for_status()
-        result = response.json()
-        if result["ok"] == 1:
-            comment = Comment.model_validate(result["data"])
-            return comment
-        else:
-            raise CommentError(result["msg"])
+        await self._invalidate("weibo_info", int(mid))
+        return Comment.model_validate(result["data"])
 
     async def del_comment(self, cid: CID) -> bool:
         """删除评论。
@@ -664,20 +1460,14 @@ class NetTool:
         Returns:
             bool: 删除结果
         """
-        params = {"cid": int(cid), "st": await self.get_token()}
-        headers = {
-            "Referer": "https://m.weibo.cn/",
-            "x-xsrf-token": await self.get_token(),
-        }
-        response = await self.client.post(
-            "https://m.weibo.cn/comments/destroy", params=params, headers=headers
+        await self._request(
+            "POST",
+            "https://m.weibo.cn/comments/destroy",
+            params={"cid": int(cid)},
+            with_st=True,
+            error=DeleteCommentError,
         )
-        response.raise_for_status()
-        result = response.json()
-        if result["ok"] == 1:
-            return True
-        else:
-            raise DeleteCommentError(result["msg"])
+        return True
 
     @staticmethod
     async def _ensure_browser_installed():
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from contextlib import aclosing
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from WeiboBot.util import parse_weibo_time
+
+T = TypeVar("T")
+C = TypeVar("C")
+
+# 获取一页：传入游标，返回本页内容和下一页的游标，没有下一页时游标为None
+PageFetcher = Callable[[C], Awaitable[Tuple[List[T], Optional[C]]]]
+
+
+def first_error(group: BaseExceptionGroup) -> BaseException:
+    """取出 TaskGroup 抛出的异常组中的第一个异常
+
+    调用方按具体异常类型处理错误（例如 CircuitOpenError），不应该看到异常组。
+    """
+    error: BaseException = group
+    while isinstance(error, BaseExceptionGroup):
+        error = error.exceptions[0]
+    return error
+
+
+async def prefetch_pages(
+    fetch: PageFetcher, cursor: C, prefetch: bool = True
+) -> AsyncIterator[List[T]]:
+    """按游标逐页获取，调用方处理当前页时提前请求下一页
+
+    提前请求在调用方停止迭代时会被取消，最多多发一个请求。
+    提前停止时请用 contextlib.aclosing 包装，以便及时取消。
+
+    Args:
+        fetch (PageFetcher): 获取一页的协程函数
+        cursor (C): 第一页的游标
+        prefetch (bool): 是否提前请求下一页
+
+    Yields:
+        List[T]: 每一页的内容
+    """
+    loop = asyncio.get_running_loop()
+    task: Optional[asyncio.Task] = loop.create_task(fetch(cursor))
+    try:
+        while task is not None:
+            items, cursor = await task
+            task = None
+            if cursor is not None and prefetch:
+                task = loop.create_task(fetch(cursor))
+            yield items
+            if cursor is not None and task is None:
+                task = loop.create_task(fetch(cursor))
+    finally:
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+async def iter_items(
+    pages: AsyncIterator[List[dict]],
+    parse: Callable[[dict], T],
+    key: Optional[Callable[[dict], Hashable]] = None,
+    max_items: Optional[int] = None,
+    max_age: Optional[float] = None,
+    until: Optional[Callable[[dict], bool]] = None,
+) -> AsyncIterator[T]:
+    """把逐页的原始数据展开成逐条的模型
+
+    只在返回前才解析模型，去重只比较相邻两页，内存占用与总条数无关。
+    页内容需要从新到旧排列，遇到超过 max_age 的条目即停止。
+
+    Args:
+        pages (AsyncIterator[List[dict]]): 逐页的原始数据，通常来自 prefetch_pages
+        parse (Callable[[dict], T]): 把一条原始数据解析成模型
+        key (Optional[Callable[[dict], Hashable]]): 去重用的键，None表示不去重
+        max_items (Optional[int]): 最多返回的条数
+        max_age (Optional[float]): 只返回这么多秒以内创建的条目
+        until (Optional[Callable[[dict], bool]]): 遇到使它为True的条目时停止，
+            例如已经处理过的ID
+
+    Yields:
+        T: 解析后的模型
+    """
+    if max_items is not None and max_items <= 0:
+        await pages.aclose()
+        return
+    deadline = time.time() - max_age if max_age is not None else None
+    count = 0
+    previous: set = set()
+    async with aclosing(pages):
+        async for page in pages:
+            current = set()
+            for data in page:
+                if key is not None:
+                    item_key = key(data)
+                    if item_key in current:
+                        continue
+                    current.add(item_key)
+                    if item_key in previous:
+                        continue
+                if until is not None and until(data):
+                    return
+                if deadline is not None:
+                    created_at = parse_weibo_time(data.get("created_at", ""))
+                    if created_at is not None and created_at.timestamp() < deadline:
+                        return
+                yield parse(data)
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+            previous = current
+
+
+async def merge_streams(
+    streams: Iterable[Callable[[], AsyncIterator[T]]],
+    concurrency: int = 4,
+    buffer: int = 100,
+) -> AsyncIterator[T]:
+    """并发消费多个异步迭代器，按到达顺序合并成一个
+
+    结果经有界队列交给调用方，调用方处理不过来时各来源会暂停。
+
+    Args:
+        streams (Iterable[Callable[[], AsyncIterator[T]]]): 创建各个来源的函数
+        concurrency (int): 同时消费的来源数
+        buffer (int): 队列长度
+
+    Yields:
+        T: 任一来源产生的条目
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+    semaphore = asyncio.Semaphore(concurrency)
+    closing = asyncio.Event()
+    done = object()
+
+    async def consume(factory: Callable[[], AsyncIterator[T]]):
+        async with semaphore:
+            async with aclosing(factory()) as stream:
+                async for item in stream:
+                    await queue.put(item)
+
+    async def drive():
+        try:
+            async with asyncio.TaskGroup() as group:
+                for factory in streams:
+                    group.create_task(consume(factory))
+        except BaseExceptionGroup as e:
+            raise first_error(e)
+        finally:
+            # 调用方已经退出时不再需要结束标记，队列也可能已满
+            if not closing.is_set():
+                await queue.put(done)
+
+    driver = asyncio.get_running_loop().create_task(drive())
+    try:
+        while (item := await queue.get()) is not done:
+            yield item
+        await driver
+    finally:
+        closing.set()
+        driver.cancel()
+        await asyncio.gather(driver, return_exceptions=True)
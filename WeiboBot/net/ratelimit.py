@@ -0,0 +1,153 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# (每秒令牌数, 桶容量)
+Rate = Tuple[float, int]
+
+READ = "read"
+WRITE = "write"
+
+# 数值越小越先放行，写操作是用户可见的，不能被轮询读请求挤掉
+PRIORITIES: Dict[str, int] = {WRITE: 0, READ: 1}
+
+DEFAULT_RATES: Dict[str, Rate] = {
+    READ: (2.0, 5),
+    WRITE: (0.5, 3),
+}
+# 同一账号所有请求的总速率
+DEFAULT_GLOBAL_RATE: Rate = (3.0, 6)
+
+
+class TokenBucket:
+    """按优先级排队的令牌桶
+
+    有令牌且无人排队时立即放行，否则进入优先级队列，
+    同优先级按到达顺序放行。
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate (float): 每秒补充的令牌数
+            burst (int): 桶容量，即允许的突发请求数
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_take(self) -> bool:
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self, priority: int = 0):
+        """取一个令牌，没有时按优先级排队等待
+
+        Args:
+            priority (int): 优先级，数值越小越先放行
+        """
+        if not self._waiters and self._try_take():
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                # 等待方已被取消
+                heapq.heappop(self._waiters)
+                continue
+            if self._try_take():
+                heapq.heappop(self._waiters)
+                future.set_result(None)
+                continue
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class RateLimiter:
+    """一个账号的请求限速器
+
+    每个请求先取所属类别（或单独配置的路径）的令牌，再取账号总速率的令牌。
+    GET 请求属于读类别，其余属于写类别，写请求优先放行。
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, Rate]] = None,
+        global_rate: Optional[Rate] = DEFAULT_GLOBAL_RATE,
+        path_rates: Optional[Dict[str, Rate]] = None,
+    ):
+        """
+        Args:
+            rates (Optional[Dict[str, Rate]]): 覆盖 DEFAULT_RATES 中读/写类别的速率
+            global_rate (Optional[Rate]): 账号总速率，None表示不限制
+            path_rates (Optional[Dict[str, Rate]]): 单独限速的路径，
+                例如 {"/api/comments/create": (0.2, 2)}
+        """
+        rates = {**DEFAULT_RATES, **(rates or {})}
+        self.buckets = {name: TokenBucket(*rate) for name, rate in rates.items()}
+        self.path_buckets = {
+            path: TokenBucket(*rate) for path, rate in (path_rates or {}).items()
+        }
+        self.global_bucket = TokenBucket(*global_rate) if global_rate else None
+
+    @staticmethod
+    def classify(method: str) -> str:
+        return READ if method.upper() == "GET" else WRITE
+
+    async def acquire(self, method: str, url: str):
+        """等待直到允许发送该请求
+
+        Args:
+            method (str): 请求方法
+            url (str): 请求地址
+        """
+        kind = self.classify(method)
+        priority = PRIORITIES[kind]
+        bucket = self.path_buckets.get(urlsplit(url).path) or self.buckets.get(kind)
+        if bucket is not None:
+            await bucket.acquire(priority)
+        if self.global_bucket is not None:
+            await self.global_bucket.acquire(priority)
+
+
+_limiters: Dict[int, RateLimiter] = {}
+
+
+def get_rate_limiter(account: int) -> RateLimiter:
+    """获取账号共用的限速器，不存在时按默认速率创建
+
+    Args:
+        account (int): 账号的用户ID，未登录时为0
+
+    Returns:
+        RateLimiter: 同一账号的所有 NetTool 共用的限速器
+    """
+    if account not in _limiters:
+        _limiters[account] = RateLimiter()
+    return _limiters[account]
+
+
+def set_rate_limiter(account: int, limiter: RateLimiter):
+    """替换账号共用的限速器，用于自定义速率"""
+    _limiters[account] = limiter
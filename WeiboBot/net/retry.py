@@ -0,0 +1,128 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, FrozenSet, Optional
+
+import httpx
+from loguru import logger
+
+from WeiboBot.exception import CircuitOpenError
+
+# 服务端暂时不可用或限流，稍后重试可能成功
+RETRY_STATUSES: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """幂等请求的重试策略，退避时间为带随机抖动的指数退避"""
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        statuses: FrozenSet[int] = RETRY_STATUSES,
+    ):
+        """
+        Args:
+            attempts (int): 首次请求失败后最多重试的次数
+            base_delay (float): 第一次重试的退避上限（秒），之后每次翻倍
+            max_delay (float): 退避时间上限（秒），Retry-After 超过它时不再重试
+            statuses (FrozenSet[int]): 需要重试的状态码
+        """
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = statuses
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """第 attempt 次重试前的等待时间，服务端给出 Retry-After 时以它为准"""
+        if retry_after is not None:
+            return retry_after
+        # 全抖动：在 [0, 上限] 内均匀取值，避免多个循环同时重试
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    @staticmethod
+    def retry_after(response: httpx.Response) -> Optional[float]:
+        """解析 Retry-After 头，支持秒数和HTTP日期两种格式"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+class CircuitBreaker:
+    """按主机统计失败的熔断器
+
+    连续失败达到阈值后熔断，熔断期间的请求直接抛出 CircuitOpenError；
+    冷却结束后只放行一个探测请求，成功则恢复，失败则继续熔断。
+    """
+
+    def __init__(
+        self, host: str, failure_threshold: int = 5, recovery_time: float = 30.0
+    ):
+        """
+        Args:
+            host (str): 主机名
+            failure_threshold (int): 触发熔断的连续失败次数
+            recovery_time (float): 熔断的冷却时间（秒）
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._probe_started = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def check(self):
+        """发送请求前调用，熔断中时抛出 CircuitOpenError"""
+        if self._opened_at is None:
+            return
+        remaining = self._opened_at + self.recovery_time - time.monotonic()
+        if remaining > 0:
+            raise CircuitOpenError(self.host, remaining)
+        now = time.monotonic()
+        if self._probing and now - self._probe_started < self.recovery_time:
+            # 已经有探测请求在路上，等它的结果
+            raise CircuitOpenError(self.host, 1.0)
+        self._probing = True
+        self._probe_started = now
+
+    def record_success(self):
+        if self._opened_at is not None:
+            logger.info(f"{self.host} 已恢复")
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            if self._opened_at is None or self._probing:
+                logger.warning(
+                    f"{self.host} 连续失败{self.failures}次，"
+                    f"暂停请求{self.recovery_time}秒"
+                )
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    """获取主机的熔断器，所有 NetTool 共用"""
+    if host not in _breakers:
+        _breakers[host] = CircuitBreaker(host)
+    return _breakers[host]
@@ -0,0 +1,50 @@
+from typing import Optional
+
+import httpx
+
+# 所有请求都发往 m.weibo.cn，保持少量长连接即可
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0
+)
+DEFAULT_TIMEOUT = httpx.Timeout(connect=5.0, read=15.0, write=10.0, pool=5.0)
+
+
+def check_http2():
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        raise ImportError("请安装h2: pip install WeiboBot[http2]")
+
+
+def create_transport(
+    limits: Optional[httpx.Limits] = None, http2: bool = False
+) -> httpx.AsyncHTTPTransport:
+    """创建连接池，可以用 SharedTransport 包装后在多个客户端之间共享
+
+    Args:
+        limits (Optional[httpx.Limits]): 连接数和长连接保持时间，默认 DEFAULT_LIMITS
+        http2 (bool): 是否启用HTTP/2
+
+    Returns:
+        httpx.AsyncHTTPTransport: 连接池
+    """
+    if http2:
+        check_http2()
+    return httpx.AsyncHTTPTransport(limits=limits or DEFAULT_LIMITS, http2=http2)
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """多个客户端共用同一个连接池时使用的包装
+
+    客户端关闭时会关闭自己的 transport，这里忽略 aclose，
+    底层连接池由创建者统一关闭。cookies 保存在各自的客户端中，互不影响。
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
@@ -1,13 +1,26 @@
+from .cache import CacheBackend, MemoryCacheBackend, ResponseCache
+from .cookie_store import CookieStore, FileCookieStore
+from .singleflight import SingleFlight
 from .tools import (
+    copy_json,
     get_cookies_value,
     httpx_cookies_to_playwright,
     load_cookies,
+    parse_weibo_time,
     save_cookies,
 )
 
 __all__ = [
+    "copy_json",
     "load_cookies",
     "save_cookies",
     "get_cookies_value",
     "httpx_cookies_to_playwright",
+    "parse_weibo_time",
+    "CookieStore",
+    "FileCookieStore",
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "ResponseCache",
+    "SingleFlight",
 ]
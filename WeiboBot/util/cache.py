@@ -0,0 +1,160 @@
+import abc
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+from .tools import copy_json
+
+
+class CacheBackend(abc.ABC):
+    """缓存的存储后端
+
+    值需要能被JSON序列化，过期时间为 time.time() 的时间戳。
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """读取未过期的值和它的过期时间，不存在时返回None"""
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: Any, expires_at: float):
+        """写入值，到 expires_at 时过期"""
+
+    @abc.abstractmethod
+    async def delete(self, key: str):
+        """删除值，不存在时忽略"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """内存中的LRU缓存"""
+
+    def __init__(self, max_size: int = 1024):
+        """
+        Args:
+            max_size (int): 最多保存的条数，超出时淘汰最久未使用的
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict[str, Tuple[Any, float]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, value: Any, expires_at: float):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ResponseCache:
+    """只读接口的响应缓存
+
+    缓存的是接口返回的原始数据，写入和命中时都会复制一份，
+    调用方修改传入的数据或用命中的数据构造的模型都不会影响缓存。
+    内存LRU在前，可选的持久化后端在后。并发未命中的合并由 NetTool 负责。
+    """
+
+    # 各接口的缓存时间（秒），0表示不缓存
+    DEFAULT_TTLS: Dict[str, float] = {
+        "user_info": 300,
+        "weibo_info": 60,
+        "weibo_comments": 30,
+    }
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_size: int = 1024,
+        backend: Optional[CacheBackend] = None,
+    ):
+        """
+        Args:
+            ttls (Optional[Dict[str, float]]): 覆盖 DEFAULT_TTLS 中的缓存时间
+            max_size (int): 内存中最多缓存的条数
+            backend (Optional[CacheBackend]): 持久化后端，例如 DbCacheBackend
+        """
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.memory = MemoryCacheBackend(max_size)
+        self.backend = backend
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """各接口的命中和未命中次数"""
+        endpoints = set(self.hits) | set(self.misses)
+        return {
+            endpoint: {"hits": self.hits[endpoint], "misses": self.misses[endpoint]}
+            for endpoint in endpoints
+        }
+
+    async def _lookup(self, key: str) -> Optional[Tuple[Any, float]]:
+        entry = await self.memory.get(key)
+        if entry is not None or self.backend is None:
+            return entry
+        try:
+            entry = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"读取缓存失败: {e}")
+            return None
+        if entry is not None:
+            await self.memory.set(key, *entry)
+        return entry
+
+    async def get(self, endpoint: str, key: Any) -> Optional[Any]:
+        """读取缓存，未命中或接口不缓存时返回None
+
+        Args:
+            endpoint (str): 接口名
+            key (Any): 接口参数，与接口名一起组成缓存键
+
+        Returns:
+            Optional[Any]: 原始数据
+        """
+        if self.ttls.get(endpoint, 0) <= 0:
+            return None
+        entry = await self._lookup(f"{endpoint}:{key}")
+        if entry is None:
+            self.misses[endpoint] += 1
+            return None
+        self.hits[endpoint] += 1
+        return copy_json(entry[0])
+
+    async def set(self, endpoint: str, key: Any, value: Any):
+        """写入缓存，过期时间由接口的缓存时间决定，不缓存的接口直接忽略"""
+        ttl = self.ttls.get(endpoint, 0)
+        if ttl <= 0:
+            return
+        cache_key = f"{endpoint}:{key}"
+        expires_at = time.time() + ttl
+        value = copy_json(value)
+        await self.memory.set(cache_key, value, expires_at)
+        if self.backend is not None:
+            try:
+                await self.backend.set(cache_key, value, expires_at)
+            except Exception as e:
+                logger.warning(f"写入缓存失败: {e}")
+
+    async def invalidate(self, endpoint: str, key: Any):
+        """删除一条缓存，用于数据被自己修改之后"""
+        cache_key = f"{endpoint}:{key}"
+        await self.memory.delete(cache_key)
+        if self.backend is not None:
+            try:
+                await self.backend.delete(cache_key)
+            except Exception as e:
+                logger.warning(f"删除缓存失败: {e}")
@@ -0,0 +1,80 @@
+import abc
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class CookieStore(abc.ABC):
+    """cookies的持久化后端
+
+    子类实现 _load 和 _save；save 会跳过与上次保存内容相同的写入。
+    """
+
+    def __init__(self):
+        self._last: Optional[Dict[str, str]] = None
+
+    @abc.abstractmethod
+    async def _load(self) -> Optional[Dict[str, str]]:
+        """读取保存的cookies，不存在时返回None"""
+
+    @abc.abstractmethod
+    async def _save(self, cookies: Dict[str, str]):
+        """写入cookies"""
+
+    async def load(self) -> Optional[Dict[str, str]]:
+        """读取cookies，不存在时返回None"""
+        cookies = await self._load()
+        self._last = cookies
+        return cookies
+
+    async def save(self, cookies: Dict[str, str]) -> bool:
+        """保存cookies
+
+        Returns:
+            bool: 是否真的写入了，内容没有变化时为False
+        """
+        cookies = dict(sorted(cookies.items()))
+        if cookies == self._last:
+            return False
+        await self._save(cookies)
+        self._last = cookies
+        return True
+
+
+class FileCookieStore(CookieStore):
+    """保存在JSON文件中的cookies，格式与 save_cookies 相同"""
+
+    def __init__(self, path: Path):
+        super().__init__()
+        self.path = Path(path)
+
+    def load_sync(self) -> Optional[Dict[str, str]]:
+        """同步读取，供初始化时使用"""
+        if not self.path.exists():
+            self._last = None
+            return None
+        with open(self.path, "r", encoding="utf-8") as f:
+            self._last = json.load(f)
+        return self._last
+
+    async def _load(self) -> Optional[Dict[str, str]]:
+        if not self.path.exists():
+            return None
+        text = await asyncio.to_thread(self.path.read_text, encoding="utf-8")
+        return json.loads(text)
+
+    def _write(self, text: str):
+        # 先写临时文件再改名，写到一半中断也不会损坏原文件
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    async def _save(self, cookies: Dict[str, str]):
+        text = json.dumps(cookies, ensure_ascii=False, indent=4)
+        await asyncio.to_thread(self._write, text)
@@ -0,0 +1,66 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    """一次正在进行的调用和等待它的调用方数量"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """相同的键同时只执行一次，并发的调用方共享同一个结果
+
+    只合并正在进行的调用，结束后立即移除，不会返回过期的数据。
+    所有调用方都被取消后，共享的调用也会被取消。
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.shared = 0  # 被合并的调用次数
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    @staticmethod
+    def _retrieve(task: asyncio.Task):
+        # 所有调用方都已离开时没人取结果，避免"exception was never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """执行 factory，同一个键已有调用在进行时等待它的结果
+
+        Args:
+            key (Hashable): 调用的键
+            factory (Callable[[], Awaitable[Any]]): 创建协程的函数
+
+        Returns:
+            Any: factory 的结果，并发的调用方拿到的是同一个对象
+        """
+        call = self._calls.get(key)
+        if call is not None:
+            self.shared += 1
+        else:
+            call = _Call(asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(self._retrieve)
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # 最后一个调用方也离开了，没有必要继续执行
+                self._forget(key, call)
+                call.task.cancel()
+                await asyncio.gather(call.task, return_exceptions=True)
@@ -1,6 +1,8 @@
 import json
+import re
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List
+from typing import Any, List, Optional
 
 import httpx
 
@@ -29,6 +31,11 @@ def load_cookies(cookies_path: Path, client: httpx.AsyncClient) -> bool:
     return True
 
 
+def copy_json(value: Any) -> Any:
+    """复制只含JSON类型的数据，比 copy.deepcopy 快"""
+    return json.loads(json.dumps(value))
+
+
 def get_cookies_value(client: httpx.AsyncClient, name: str) -> str:
     for cookie in client.cookies.jar:
         if cookie.name == name:
@@ -52,3 +59,47 @@ def httpx_cookies_to_playwright(httpx_cookies) -> List[dict]:
             }
         )
     return cookies
+
+
+# 微博接口返回的时间都是北京时间
+CHINA_TZ = timezone(timedelta(hours=8))
+
+
+def parse_weibo_time(text: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """解析微博接口中的时间
+
+    支持 "Sat Oct 18 12:00:00 +0800 2025" 格式，以及移动端的
+    "刚刚"、"5分钟前"、"3小时前"、"今天 12:00"、"昨天 12:00"、"10-18"、"2024-10-18"。
+
+    Args:
+        text (str): 时间字符串
+        now (Optional[datetime]): 相对时间的基准，默认为当前时间
+
+    Returns:
+        Optional[datetime]: 带时区的时间，无法解析时为None
+    """
+    text = (text or "").strip()
+    try:
+        return datetime.strptime(text, "%a %b %d %H:%M:%S %z %Y")
+    except ValueError:
+        pass
+    now = (now or datetime.now(CHINA_TZ)).astimezone(CHINA_TZ)
+    if text == "刚刚":
+        return now
+    if match := re.fullmatch(r"(\d+)\s*(秒|分钟|小时)前", text):
+        unit = {"秒": "seconds", "分钟": "minutes", "小时": "hours"}[match[2]]
+        return now - timedelta(**{unit: int(match[1])})
+    if match := re.fullmatch(r"(今天|昨天)\s*(\d{1,2}):(\d{2})", text):
+        day = now if match[1] == "今天" else now - timedelta(days=1)
+        return day.replace(
+            hour=int(match[2]), minute=int(match[3]), second=0, microsecond=0
+        )
+    for fmt in ("%Y-%m-%d", "%m-%d"):
+        try:
+            parsed = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if fmt == "%m-%d":
+            parsed = parsed.replace(year=now.year)
+        return parsed.replace(tzinfo=CHINA_TZ)
+    return None
@@ -0,0 +1,70 @@
+"""记录表写入的微基准测试
+
+对比默认连接参数逐条写入、调优后的连接参数逐条写入、以及后台批量写入三种方式的每秒写入数。
+
+    python -m benchmarks.bench_db -n 2000
+
+需要在仓库根目录下运行，以便导入 WeiboBot。
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from tortoise import Tortoise
+
+from WeiboBot.data import RecordWriter, WeiboRead, init_db
+
+# 调优前SQLite的默认行为：回滚日志 + 每次提交都fsync
+LEGACY_PRAGMAS = {
+    "journal_mode": "DELETE",
+    "synchronous": "FULL",
+    "mmap_size": 0,
+    "cache_size": -2000,
+    "temp_store": "DEFAULT",
+}
+
+
+async def bench_create_record(db_path: Path, n: int, pragmas=None) -> float:
+    await init_db(db_path, pragmas)
+    start = time.perf_counter()
+    for mid in range(n):
+        await WeiboRead.create_record(mid)
+    elapsed = time.perf_counter() - start
+    await Tortoise.close_connections()
+    return n / elapsed
+
+
+async def bench_write_behind(db_path: Path, n: int, pragmas=None) -> float:
+    await init_db(db_path, pragmas)
+    writer = RecordWriter(flush_interval=0.05)
+    writer.start()
+    start = time.perf_counter()
+    for mid in range(n):
+        writer.put(WeiboRead, mid)
+        await asyncio.sleep(0)
+    await writer.close()
+    elapsed = time.perf_counter() - start
+    assert await WeiboRead.all().count() == n
+    await Tortoise.close_connections()
+    return n / elapsed
+
+
+async def main(n: int):
+    cases = [
+        ("默认参数 + 逐条写入", bench_create_record, LEGACY_PRAGMAS),
+        ("调优参数 + 逐条写入", bench_create_record, None),
+        ("调优参数 + 后台批量写入", bench_write_behind, None),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (name, bench, pragmas) in enumerate(cases):
+            rate = await bench(Path(tmp) / f"bench_{i}.db", n, pragmas)
+            print(f"{name:<24}{rate:>12.0f} 条/秒")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=2000, help="写入条数")
+    asyncio.run(main(parser.parse_args().n))
@@ -0,0 +1,86 @@
+"""微博详情页解析的微基准测试
+
+对比整页 BeautifulSoup + 贪婪正则的旧解析方式与 extract_render_data 的每秒解析页数。
+默认使用构造的详情页，也可以用 --pages 指定保存下来的 /detail/{mid} 页面目录。
+
+    python -m benchmarks.bench_extract -n 200 --pages captured/
+
+需要在仓库根目录下运行，以便导入 WeiboBot。
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from WeiboBot.exception import WeiboNotExist
+from WeiboBot.net.extract import _legacy_extract, extract_render_data
+
+
+def sample_page(text_size: int = 2000, filler_size: int = 60_000) -> str:
+    """构造一个与真实详情页结构相同的页面"""
+    status = {
+        "id": "5000000000000000",
+        "mid": "5000000000000000",
+        "created_at": "Sat Oct 18 12:00:00 +0800 2025",
+        "text": "微博正文" * (text_size // 4),
+        "visible": {"type": 0, "list_id": 0},
+        "user": {"id": 1, "screen_name": "用户"},
+        "pics": [{"url": f"https://wx1.sinaimg.cn/{i}.jpg"} for i in range(9)],
+    }
+    render_data = json.dumps(
+        [{"status": status, "call": 1, "hotScheme": "sinaweibo://"}],
+        ensure_ascii=False,
+        indent=4,
+    )
+    filler = "<style>" + ".a{color:red}" * (filler_size // 13) + "</style>"
+    return (
+        f"<!DOCTYPE html><html><head>{filler}</head><body>"
+        f'<div id="app"></div><script>\n'
+        f"var $render_data = {render_data}[0] || {{}};\n"
+        f"var config = {{}};</script></body></html>"
+    )
+
+
+def error_page() -> str:
+    return (
+        "<!DOCTYPE html><html><head><title>微博</title></head><body>"
+        "<div><p>微博不存在或暂无查看权限!</p></div></body></html>"
+    )
+
+
+def bench(extract: Callable[[str], dict], pages: List[str], n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        for page in pages:
+            try:
+                extract(page)
+            except WeiboNotExist:
+                pass
+    return n * len(pages) / (time.perf_counter() - start)
+
+
+def main(n: int, pages_dir: Path = None):
+    if pages_dir:
+        pages = [p.read_text(encoding="utf-8") for p in pages_dir.glob("*.html")]
+    else:
+        pages = [sample_page(), sample_page(text_size=200), error_page()]
+    assert all(
+        extract_render_data(p) == _legacy_extract(p)
+        for p in pages
+        if "render_data" in p
+    )
+    for name, extract in [
+        ("整页解析", _legacy_extract),
+        ("extract_render_data", extract_render_data),
+    ]:
+        print(f"{name:<24}{bench(extract, pages, n):>12.0f} 页/秒")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=200, help="每个页面解析的次数")
+    parser.add_argument("--pages", type=Path, help="保存的详情页目录，文件后缀为 .html")
+    args = parser.parse_args()
+    main(args.n, args.pages)
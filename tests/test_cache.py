@@ -0,0 +1,105 @@
+import asyncio
+import json
+import time
+
+import httpx
+
+from WeiboBot.net import NetTool, RateLimiter
+from WeiboBot.util import ResponseCache
+
+
+def weibo(mid: str) -> dict:
+    return {
+        "visible": {"type": 0},
+        "created_at": "x",
+        "id": mid,
+        "mid": mid,
+        "text": "原文",
+    }
+
+
+def comment(cid: int) -> dict:
+    return {
+        "id": cid,
+        "mid": str(cid),
+        "created_at": "x",
+        "text": "评论",
+        "source": "s",
+        "pics": ["a.jpg"],
+    }
+
+
+async def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.startswith("/detail/"):
+        status = weibo(request.url.path.rsplit("/", 1)[-1])
+        page = f"var $render_data = {json.dumps([{'status': status}])}[0] || {{}};"
+        return httpx.Response(200, text=page)
+    if request.url.path == "/comments/hotflow":
+        data = {"data": [comment(1), comment(2)], "max_id": 0}
+        return httpx.Response(200, json={"ok": 1, "data": data})
+    return httpx.Response(200, json={"ok": 1})
+
+
+def make_client(cache: ResponseCache) -> NetTool:
+    client = NetTool(
+        {"XSRF-TOKEN": "x"},
+        transport=httpx.MockTransport(handler),
+        rate_limiter=RateLimiter(global_rate=None, rates={"read": (1000, 1000)}),
+        cache=cache,
+    )
+    client._last_refresh_token_time = time.time()
+    return client
+
+
+def test_cache_copies_on_set_and_get():
+    async def main():
+        cache = ResponseCache()
+        value = {"user": {"name": "a"}}
+        await cache.set("user_info", 1, value)
+        value["user"]["name"] = "changed"
+        hit = await cache.get("user_info", 1)
+        assert hit == {"user": {"name": "a"}}
+        hit["user"]["name"] = "changed"
+        assert await cache.get("user_info", 1) == {"user": {"name": "a"}}
+        assert cache.stats() == {"user_info": {"hits": 2, "misses": 0}}
+
+    asyncio.run(main())
+
+
+def test_mutating_weibo_does_not_leak_into_cache():
+    async def main():
+        cache = ResponseCache()
+        client = make_client(cache)
+        try:
+            for _ in range(2):
+                weibo = await client.weibo_info(5, lazy=True)
+                assert weibo.text == "原文"
+                assert weibo.metadata["text"] == "原文"
+                assert weibo.visible == {"type": 0}
+                weibo.text = "MUTATED"
+                weibo.metadata["text"] = "MUTATED"
+                weibo.visible["type"] = 7
+        finally:
+            await client.client.aclose()
+        assert cache.stats()["weibo_info"] == {"hits": 1, "misses": 1}
+
+    asyncio.run(main())
+
+
+def test_mutating_comments_does_not_leak_into_cache():
+    async def main():
+        cache = ResponseCache()
+        client = make_client(cache)
+        try:
+            for _ in range(2):
+                comments = await client.get_weibo_comments(5, 2)
+                assert [c.text for c in comments] == ["评论", "评论"]
+                assert comments[0].pics == ["a.jpg"]
+                comments[0].text = "MUTATED"
+                comments[0].metadata["text"] = "MUTATED"
+                comments[0].pics.append("b.jpg")
+        finally:
+            await client.client.aclose()
+        assert cache.stats()["weibo_comments"] == {"hits": 1, "misses": 1}
+
+    asyncio.run(main())
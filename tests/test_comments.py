@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from WeiboBot.net import NetTool, RateLimiter
+
+
+def comment(cid: int, **kwargs) -> dict:
+    return {
+        "id": cid,
+        "mid": str(cid),
+        "created_at": "x",
+        "text": "c",
+        "source": "s",
+        **kwargs,
+    }
+
+
+def make_client(handler) -> NetTool:
+    client = NetTool(
+        {"XSRF-TOKEN": "x"},
+        transport=httpx.MockTransport(handler),
+        rate_limiter=RateLimiter(global_rate=None, rates={"read": (1000, 1000)}),
+    )
+    client._last_refresh_token_time = time.time()
+    return client
+
+
+def threads_handler(reply_status: int):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/comments/hotflow":
+            data = {"data": [comment(i, total_number=3) for i in range(3)]}
+            return httpx.Response(200, json={"ok": 1, "data": data})
+        if reply_status != 200:
+            return httpx.Response(reply_status)
+        cid = int(request.url.params["cid"])
+        replies = [comment(cid * 10 + j) for j in range(3)]
+        return httpx.Response(200, json={"ok": 1, "data": replies, "max_id": 0})
+
+    return handler
+
+
+def test_comment_threads_collect_replies():
+    async def main():
+        client = make_client(threads_handler(200))
+        try:
+            threads = [c async for c in client.iter_comment_threads(1, max_replies=2)]
+        finally:
+            await client.client.aclose()
+        assert sorted(c.id for c in threads) == [0, 1, 2]
+        assert all(len(c.comments) == 2 for c in threads)
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("flatten", [True, False])
+def test_reply_errors_are_not_wrapped_in_exception_group(flatten):
+    async def main():
+        client = make_client(threads_handler(404))
+        iterator = client.iter_all_comments if flatten else client.iter_comment_threads
+        try:
+            with pytest.raises(httpx.HTTPStatusError):
+                async for _ in iterator(1):
+                    pass
+        finally:
+            await client.client.aclose()
+
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from WeiboBot.exception import WeiboNotExist
+from WeiboBot.net.extract import NOT_EXIST_TEXT, extract_render_data
+
+STATUS = {"id": "5", "text": "正文 ]}[0] 结尾"}
+
+
+def detail_page(payload: str, marker: str = "var $render_data = [") -> str:
+    return (
+        f"<html><script>{marker}{payload}][0] || {{}};</script><div>尾部</div></html>"
+    )
+
+
+def test_fast_path():
+    html = detail_page(json.dumps({"status": STATUS}, ensure_ascii=False))
+    assert extract_render_data(html) == {"status": STATUS}
+
+
+def test_marker_with_different_spacing():
+    html = detail_page(json.dumps({"status": STATUS}), "var $render_data  =\n[")
+    assert extract_render_data(html)["status"] == STATUS
+
+
+def test_missing_marker():
+    with pytest.raises(ValueError):
+        extract_render_data("<html><body>登录</body></html>")
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        '{"status": {"id": "5", "text": "被截断',
+        '{"status": {"id": 5,}}',
+        "not json",
+    ],
+)
+def test_invalid_payload(payload):
+    with pytest.raises(ValueError):
+        extract_render_data(detail_page(payload))
+
+
+def test_truncated_page():
+    html = detail_page(json.dumps({"status": STATUS}))
+    with pytest.raises(ValueError):
+        extract_render_data(html[: html.index('"text"')])
+
+
+def test_not_found_page():
+    html = f"<html><body><div><p>{NOT_EXIST_TEXT}</p></div></body></html>"
+    with pytest.raises(WeiboNotExist):
+        extract_render_data(html)
@@ -0,0 +1,163 @@
+import asyncio
+import time
+
+import httpx
+from tortoise import Tortoise
+
+from WeiboBot import Bot
+from WeiboBot.net import NetTool, RateLimiter
+
+
+def weibo(mid: int) -> dict:
+    return {
+        "visible": {},
+        "created_at": "x",
+        "id": str(mid),
+        "mid": str(mid),
+        "text": "t",
+    }
+
+
+class Feed:
+    """按 since_id / max_id 分页的关注页面，每页10条，从新到旧"""
+
+    def __init__(self, mids):
+        self.mids = sorted(mids, reverse=True)
+        self.requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        max_id = int(request.url.params.get("max_id", 0))
+        since_id = int(request.url.params.get("since_id", 0))
+        items = [
+            mid for mid in self.mids if (not max_id or mid <= max_id) and mid > since_id
+        ][:10]
+        next_id = items[-1] - 1 if len(items) == 10 else 0
+        data = {
+            "max_id": next_id,
+            "interval": 5000,
+            "statuses": [weibo(mid) for mid in items],
+        }
+        return httpx.Response(200, json={"ok": 1, "data": data})
+
+
+def make_bot(feed: Feed, db_path) -> Bot:
+    bot = Bot(
+        {"XSRF-TOKEN": "x"},
+        db_path=db_path,
+        transport=httpx.MockTransport(feed),
+        rate_limiter=RateLimiter(global_rate=None, rates={"read": (1000, 1000)}),
+        feed_max_retries=3,
+    )
+    bot._last_refresh_token_time = time.time()
+    return bot
+
+
+def test_cursor_pages_back_and_persists(tmp_path):
+    feed = Feed(range(101, 131))
+    db_path = tmp_path / "bot.db"
+
+    async def main():
+        bot = make_bot(feed, db_path)
+        got = []
+
+        @bot.onNewWeibo()
+        async def on_weibo(weibo):
+            got.append(int(weibo.id))
+
+        try:
+            await bot.setup_db()
+            assert await bot.scan_pages_loop() == 10
+            assert bot.feed_since_id == 130
+            feed.mids = sorted(range(101, 156), reverse=True)
+            feed.requests = 0
+            got.clear()
+            assert await bot.scan_pages_loop() == 25
+            assert sorted(got) == list(range(131, 156))
+            assert feed.requests == 3
+            restarted = make_bot(feed, db_path)
+            await restarted.setup_db(init=False)
+            assert restarted.feed_since_id == 155
+        finally:
+            await Tortoise.close_connections()
+
+    asyncio.run(main())
+
+
+def test_failing_weibo_does_not_pin_cursor(tmp_path):
+    feed = Feed(range(101, 121))
+
+    async def main():
+        bot = make_bot(feed, tmp_path / "bot.db")
+        attempts = []
+
+        @bot.onNewWeibo()
+        async def on_weibo(weibo):
+            if weibo.id == "115":
+                attempts.append(weibo.id)
+                raise RuntimeError("boom")
+
+        try:
+            await bot.setup_db()
+            await bot.scan_pages_loop()
+            assert bot.feed_since_id == 120
+            requests = []
+            for _ in range(5):
+                feed.requests = 0
+                await bot.scan_pages_loop()
+                requests.append(feed.requests)
+            assert requests == [1] * 5
+            assert bot.feed_since_id == 120
+            assert len(attempts) == 3
+            assert not bot._feed_retries
+            assert 115 in await bot.weibo_read.filter_unseen([115, 116])
+            assert 116 not in await bot.weibo_read.filter_unseen([115, 116])
+        finally:
+            await Tortoise.close_connections()
+
+    asyncio.run(main())
+
+
+def test_retried_weibo_is_marked_once_handled(tmp_path):
+    feed = Feed(range(101, 106))
+
+    async def main():
+        bot = make_bot(feed, tmp_path / "bot.db")
+        failures = iter([True, False])
+
+        @bot.onNewWeibo()
+        async def on_weibo(weibo):
+            if weibo.id == "103" and next(failures):
+                raise RuntimeError("boom")
+
+        try:
+            await bot.setup_db()
+            await bot.scan_pages_loop()
+            assert 103 in bot._feed_retries
+            await bot.scan_pages_loop()
+            assert not bot._feed_retries
+            assert not await bot.weibo_read.filter_unseen([103])
+        finally:
+            await Tortoise.close_connections()
+
+    asyncio.run(main())
+
+
+def test_iter_feed_records_interval():
+    feed = Feed(range(101, 126))
+
+    async def main():
+        client = NetTool(
+            {"XSRF-TOKEN": "x"},
+            transport=httpx.MockTransport(feed),
+            rate_limiter=RateLimiter(global_rate=None, rates={"read": (1000, 1000)}),
+        )
+        client._last_refresh_token_time = time.time()
+        try:
+            mids = [int(weibo.id) async for weibo in client.iter_feed(prefetch=False)]
+        finally:
+            await client.client.aclose()
+        assert mids == list(range(125, 100, -1))
+        assert client.feed_interval == 5
+
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+import asyncio
+
+from tortoise import Tortoise
+
+from WeiboBot.data import ScalableBloomFilter, SeenIndex, WeiboRead, init_db
+
+
+def test_scalable_bloom_grows_without_false_negatives():
+    bloom = ScalableBloomFilter(100)
+    for key in range(1000):
+        bloom.add(key)
+    assert len(bloom.filters) > 1
+    assert all(key in bloom for key in range(1000))
+
+
+def test_index_is_sized_from_row_count(tmp_path):
+    async def main():
+        await init_db(tmp_path / "bot.db")
+        try:
+            index = SeenIndex(WeiboRead, min_capacity=100)
+            await index.load()
+            empty = index.bloom.nbytes
+            assert index.bloom.capacity == 100
+            await WeiboRead.bulk_create_records(range(1, 501))
+            await index.load()
+            assert index.bloom.capacity == 1000
+            assert index.bloom.nbytes > empty
+            assert await index.filter_unseen([1, 500, 501]) == {501}
+        finally:
+            await Tortoise.close_connections()
+
+    asyncio.run(main())
+
+
+def test_reload_keeps_unwritten_records(tmp_path):
+    async def main():
+        await init_db(tmp_path / "bot.db")
+        try:
+            index = SeenIndex(WeiboRead)
+            await index.load()
+            index.add(42)
+            await index.load()
+            assert await index.filter_unseen([42, 43]) == {43}
+        finally:
+            await Tortoise.close_connections()
+
+    asyncio.run(main())
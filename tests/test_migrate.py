@@ -0,0 +1,86 @@
+import asyncio
+import sqlite3
+
+from tortoise import Tortoise
+
+from WeiboBot.data import MentionCmtRead, WeiboRead, WeiboRepost, init_db
+from WeiboBot.data.db import SCHEMA_VERSION
+
+# 升级前各记录表的结构：mid 为普通INT列，没有唯一约束和账号列
+BASELINE_TABLES = ["weibo_read", "mention_cmt_read", "weibo_repost"]
+BASELINE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS "{table}" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "mid" INT NOT NULL
+);
+"""
+
+
+def create_baseline_db(path):
+    conn = sqlite3.connect(path)
+    for table in BASELINE_TABLES:
+        conn.executescript(BASELINE_SCHEMA.format(table=table))
+    conn.executemany(
+        'INSERT INTO "weibo_read" ("mid") VALUES (?)',
+        [(5000000000000001,), (5000000000000002,), (5000000000000001,)],
+    )
+    conn.execute('INSERT INTO "weibo_repost" ("mid") VALUES (7)')
+    conn.commit()
+    conn.close()
+
+
+def user_version(path) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_migrate_baseline_db(tmp_path):
+    path = tmp_path / "weibo_bot.db"
+    create_baseline_db(path)
+
+    async def main():
+        await init_db(path)
+        try:
+            rows = await WeiboRead.all().order_by("id").values_list("mid", "account")
+            assert rows == [(5000000000000001, 0), (5000000000000002, 0)]
+            assert all(r.created_at is not None for r in await WeiboRead.all())
+            assert await WeiboRepost.get_existing_mids([7, 8]) == {7}
+            assert await MentionCmtRead.all().count() == 0
+            # 迁移后 (account, mid) 唯一，重复写入会被忽略
+            await WeiboRead.bulk_create_records([5000000000000001, 3])
+            assert await WeiboRead.all().count() == 3
+        finally:
+            await Tortoise.close_connections()
+
+    asyncio.run(main())
+    assert user_version(path) == SCHEMA_VERSION
+
+
+def test_migrate_is_idempotent(tmp_path):
+    path = tmp_path / "weibo_bot.db"
+    create_baseline_db(path)
+
+    async def open_and_count() -> int:
+        await init_db(path)
+        try:
+            return await WeiboRead.all().count()
+        finally:
+            await Tortoise.close_connections()
+
+    assert asyncio.run(open_and_count()) == 2
+    assert asyncio.run(open_and_count()) == 2
+    assert user_version(path) == SCHEMA_VERSION
+
+
+def test_new_db_starts_at_current_version(tmp_path):
+    path = tmp_path / "weibo_bot.db"
+
+    async def main():
+        await init_db(path)
+        await Tortoise.close_connections()
+
+    asyncio.run(main())
+    assert user_version(path) == SCHEMA_VERSION
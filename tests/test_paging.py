@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from WeiboBot.exception import CircuitOpenError
+from WeiboBot.net.paging import iter_items, merge_streams, prefetch_pages
+
+
+def stream(items, error=None, delay=0.0):
+    async def iterate():
+        for item in items:
+            await asyncio.sleep(delay)
+            yield item
+        if error is not None:
+            raise error
+
+    return iterate
+
+
+def test_merge_streams_yields_every_item():
+    async def main():
+        streams = [stream(range(i * 10, i * 10 + 5), delay=0.001) for i in range(3)]
+        return [item async for item in merge_streams(streams, concurrency=2)]
+
+    assert sorted(asyncio.run(main())) == [
+        *range(0, 5),
+        *range(10, 15),
+        *range(20, 25),
+    ]
+
+
+def test_merge_streams_reraises_original_error():
+    async def main():
+        streams = [
+            stream(range(100), delay=0.01),
+            stream([1, 2], error=CircuitOpenError("m.weibo.cn", 5)),
+        ]
+        with pytest.raises(CircuitOpenError) as info:
+            async for _ in merge_streams(streams):
+                pass
+        assert info.value.retry_after == 5
+
+    asyncio.run(main())
+
+
+def test_iter_items_dedups_adjacent_pages_and_stops():
+    pages = [[{"id": 3}, {"id": 2}], [{"id": 2}, {"id": 1}], [{"id": 0}]]
+
+    async def fetch(cursor):
+        next_cursor = cursor + 1 if cursor + 1 < len(pages) else None
+        return pages[cursor], next_cursor
+
+    async def main():
+        items = iter_items(
+            prefetch_pages(fetch, 0),
+            lambda data: data["id"],
+            key=lambda data: data["id"],
+            until=lambda data: data["id"] == 0,
+        )
+        return [item async for item in items]
+
+    assert asyncio.run(main()) == [3, 2, 1]
@@ -0,0 +1,59 @@
+import asyncio
+
+from WeiboBot.net import RateLimiter
+from WeiboBot.net.ratelimit import TokenBucket
+
+
+async def queue(acquire, jobs):
+    """按 jobs 的顺序排队，返回实际放行的顺序"""
+    order = []
+
+    async def run(name, *args):
+        await acquire(*args)
+        order.append(name)
+
+    tasks = []
+    for name, *args in jobs:
+        tasks.append(asyncio.create_task(run(name, *args)))
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_bucket_serves_higher_priority_first():
+    async def main():
+        bucket = TokenBucket(rate=50, burst=1)
+        await bucket.acquire(1)
+        jobs = [("r1", 1), ("r2", 1), ("w1", 0), ("r3", 1), ("w2", 0)]
+        return await queue(bucket.acquire, jobs)
+
+    assert asyncio.run(main()) == ["w1", "w2", "r1", "r2", "r3"]
+
+
+def test_cancelled_waiter_is_skipped():
+    async def main():
+        bucket = TokenBucket(rate=50, burst=1)
+        await bucket.acquire()
+        cancelled = asyncio.create_task(bucket.acquire(0))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        order = await queue(bucket.acquire, [("r1", 1), ("r2", 1)])
+        assert cancelled.cancelled()
+        return order
+
+    assert asyncio.run(main()) == ["r1", "r2"]
+
+
+def test_writes_overtake_queued_reads():
+    async def main():
+        limiter = RateLimiter(rates={"read": (1000, 1000)}, global_rate=(50, 1))
+        url = "https://m.weibo.cn/api/config"
+        await limiter.acquire("GET", url)
+        jobs = [
+            ("get1", "GET", url),
+            ("get2", "GET", url),
+            ("post", "POST", "https://m.weibo.cn/api/comments/create"),
+        ]
+        return await queue(limiter.acquire, jobs)
+
+    assert asyncio.run(main()) == ["post", "get1", "get2"]
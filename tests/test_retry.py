@@ -0,0 +1,98 @@
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from WeiboBot.exception import CircuitOpenError
+from WeiboBot.net.retry import CircuitBreaker, RetryPolicy
+
+
+def open_breaker(recovery_time: float = 0.05) -> CircuitBreaker:
+    breaker = CircuitBreaker(
+        "m.weibo.cn", failure_threshold=3, recovery_time=recovery_time
+    )
+    for _ in range(3):
+        breaker.check()
+        breaker.record_failure()
+    return breaker
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker("m.weibo.cn", failure_threshold=3)
+    for _ in range(2):
+        breaker.record_failure()
+    assert not breaker.is_open
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError) as e:
+        breaker.check()
+    assert 0 < e.value.retry_after <= 30
+
+
+def test_success_before_threshold_resets_failures():
+    breaker = CircuitBreaker("m.weibo.cn", failure_threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert not breaker.is_open
+
+
+def test_half_open_allows_one_probe_then_closes():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    breaker.check()
+    # 探测请求还没有结果时，其余请求继续被拒绝
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.failures == 0
+    breaker.check()
+
+
+def test_failed_probe_reopens():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    time.sleep(0.06)
+    breaker.check()
+    breaker.record_success()
+    assert not breaker.is_open
+
+
+def test_retry_after_seconds():
+    response = httpx.Response(429, headers={"Retry-After": "12"})
+    assert RetryPolicy.retry_after(response) == 12
+    response = httpx.Response(429, headers={"Retry-After": "-3"})
+    assert RetryPolicy.retry_after(response) == 0
+
+
+def test_retry_after_http_date():
+    value = formatdate(time.time() + 60, usegmt=True)
+    response = httpx.Response(503, headers={"Retry-After": value})
+    assert 55 <= RetryPolicy.retry_after(response) <= 60
+    past = formatdate(time.time() - 60, usegmt=True)
+    response = httpx.Response(503, headers={"Retry-After": past})
+    assert RetryPolicy.retry_after(response) == 0
+
+
+@pytest.mark.parametrize("value", [None, "", "soon"])
+def test_retry_after_missing_or_invalid(value):
+    headers = {} if value is None else {"Retry-After": value}
+    assert RetryPolicy.retry_after(httpx.Response(503, headers=headers)) is None
+
+
+def test_backoff_bounds():
+    policy = RetryPolicy(base_delay=0.5, max_delay=3)
+    for attempt, limit in enumerate([0.5, 1, 2, 3, 3]):
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        assert all(0 <= d <= limit for d in delays)
+        assert max(delays) > limit / 2
+    assert policy.backoff(5, retry_after=7) == 7
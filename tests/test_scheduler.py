@@ -0,0 +1,123 @@
+import asyncio
+
+from WeiboBot.bot.scheduler import AdaptiveInterval, ScheduledTask, Scheduler
+from WeiboBot.exception import CircuitOpenError
+
+
+def test_failures_back_off_exponentially():
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def main():
+        task = ScheduledTask("t", fail, interval=2, max_backoff=10)
+        delays = []
+        for _ in range(4):
+            await task.run_once()
+            delays.append(task.next_delay(0))
+        return task, delays
+
+    task, delays = asyncio.run(main())
+    assert task.failures == 4
+    assert delays == [4, 8, 10, 10]
+
+
+def test_success_resets_backoff():
+    results = [RuntimeError("boom"), None]
+
+    async def flaky():
+        result = results.pop(0)
+        if result is not None:
+            raise result
+
+    async def main():
+        task = ScheduledTask("t", flaky, interval=2)
+        await task.run_once()
+        assert task.next_delay(0) == 4
+        await task.run_once()
+        return task
+
+    task = asyncio.run(main())
+    assert task.failures == 0
+    assert task.next_delay(0.5) == 1.5
+
+
+def test_circuit_open_pauses_without_counting_failure():
+    async def open_circuit():
+        raise CircuitOpenError("m.weibo.cn", 25)
+
+    async def main():
+        task = ScheduledTask("t", open_circuit, interval=5)
+        await task.run_once()
+        return task
+
+    task = asyncio.run(main())
+    assert task.failures == 0
+    assert task.next_delay(0) == 25
+
+
+def test_adaptive_interval_follows_new_items():
+    counts = [0, 0, 3]
+
+    async def poll():
+        return counts.pop(0)
+
+    async def main():
+        adaptive = AdaptiveInterval(min_interval=2, max_interval=8)
+        task = ScheduledTask("t", poll, interval=4, adaptive=adaptive)
+        intervals = []
+        for _ in range(3):
+            await task.run_once()
+            intervals.append(task.interval)
+        return intervals
+
+    assert asyncio.run(main()) == [6, 8, 4]
+
+
+def test_failing_task_does_not_block_others():
+    runs = {"ok": 0}
+
+    async def ok():
+        runs["ok"] += 1
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def main():
+        scheduler = Scheduler()
+        scheduler.add("ok", ok, 0.01)
+        scheduler.add("fail", fail, 0.01)
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+        return scheduler
+
+    scheduler = asyncio.run(main())
+    assert runs["ok"] > 3
+    assert scheduler.get("fail").failures >= 1
+
+
+def test_limit_covers_only_the_fetch():
+    order = []
+
+    async def main():
+        semaphore = asyncio.Semaphore(1)
+        slow = Scheduler(semaphore)
+        other = Scheduler(semaphore)
+
+        async def slow_poll():
+            async with slow.limit():
+                await asyncio.sleep(0.01)
+            # 处理事件时不占用共享的信号量
+            await asyncio.sleep(0.2)
+            order.append("slow handled")
+
+        async def fast_poll():
+            async with other.limit():
+                order.append("fast fetched")
+
+        slow_task = ScheduledTask("slow", slow_poll, interval=1)
+        fast_task = ScheduledTask("fast", fast_poll, interval=1)
+        await asyncio.gather(slow_task.run_once(), fast_task.run_once())
+
+    asyncio.run(main())
+    assert order == ["fast fetched", "slow handled"]
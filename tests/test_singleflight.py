@@ -0,0 +1,104 @@
+import asyncio
+import time
+from contextlib import aclosing
+
+import httpx
+
+from WeiboBot.net import NetTool, RateLimiter
+from WeiboBot.util import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(5)))
+        assert results == [1] * 5
+        assert flight.shared == 4
+        assert "k" not in flight
+
+    asyncio.run(main())
+    assert calls == 1
+
+
+def test_cancelling_last_waiter_cancels_call():
+    finished = False
+
+    async def fetch():
+        nonlocal finished
+        await asyncio.sleep(0.2)
+        finished = True
+
+    async def main():
+        flight = SingleFlight()
+        waiters = [asyncio.ensure_future(flight.do("k", fetch)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        assert "k" not in flight
+        await asyncio.sleep(0.3)
+
+    asyncio.run(main())
+    assert not finished
+
+
+def test_remaining_waiter_keeps_call_running():
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def main():
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do("k", fetch))
+        second = asyncio.ensure_future(flight.do("k", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == "ok"
+
+    asyncio.run(main())
+
+
+def test_prefetched_page_cancelled_when_iteration_stops():
+    completed = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        max_id = int(request.url.params["max_id"])
+        if max_id:
+            await asyncio.sleep(0.3)
+        completed.append(max_id)
+        comment = {
+            "id": max_id + 1,
+            "mid": str(max_id + 1),
+            "created_at": "x",
+            "text": "c",
+            "source": "s",
+        }
+        return httpx.Response(
+            200, json={"ok": 1, "data": {"data": [comment], "max_id": max_id + 1}}
+        )
+
+    async def main():
+        client = NetTool(
+            {"XSRF-TOKEN": "x"},
+            transport=httpx.MockTransport(handler),
+            rate_limiter=RateLimiter(global_rate=None, rates={"read": (1000, 1000)}),
+        )
+        client._last_refresh_token_time = time.time()
+        try:
+            async with aclosing(client.iter_weibo_comments(1)) as comments:
+                async for _ in comments:
+                    break
+            await asyncio.sleep(0.5)
+        finally:
+            await client.client.aclose()
+
+    asyncio.run(main())
+    assert completed == [0]
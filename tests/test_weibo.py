@@ -0,0 +1,52 @@
+import asyncio
+import json
+import time
+
+import httpx
+
+from WeiboBot.net import NetTool, RateLimiter
+from WeiboBot.util import ResponseCache
+
+
+def weibo(mid: str, **kwargs) -> dict:
+    return {
+        "visible": {},
+        "created_at": "x",
+        "id": mid,
+        "mid": mid,
+        "text": "t",
+        **kwargs,
+    }
+
+
+async def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/detail/5":
+        status = weibo("5", retweeted_status=weibo("4"))
+        page = f"var $render_data = {json.dumps([{'status': status}])}[0] || {{}};"
+        return httpx.Response(200, text=page)
+    if request.url.path == "/comments/hotflow":
+        assert request.url.params["id"] == "4"
+        comment = {"id": 1, "mid": "1", "created_at": "x", "text": "c", "source": "s"}
+        return httpx.Response(200, json={"ok": 1, "data": {"data": [comment]}})
+    return httpx.Response(404)
+
+
+def test_bind_covers_retweeted_status():
+    async def main():
+        client = NetTool(
+            {"XSRF-TOKEN": "x"},
+            transport=httpx.MockTransport(handler),
+            rate_limiter=RateLimiter(global_rate=None, rates={"read": (1000, 1000)}),
+            cache=ResponseCache(),
+        )
+        client._last_refresh_token_time = time.time()
+        try:
+            # 第二次来自缓存，走跳过校验的构造方式
+            for _ in range(2):
+                weibo = await client.weibo_info(5, lazy=True)
+                comments = await weibo.retweeted_status.fetch_comments(1)
+                assert [c.id for c in comments] == [1]
+        finally:
+            await client.client.aclose()
+
+    asyncio.run(main())